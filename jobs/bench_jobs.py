@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+"""
+Job Search Benchmarks
+Offline benchmarks for jobs.py: micro-benchmarks for the hot paths and a
+per-stage pipeline suite that replays saved pages through a local server
+
+Usage:
+    python3 bench_jobs.py                        # run every benchmark
+    python3 bench_jobs.py scoring                # run a single benchmark
+    python3 bench_jobs.py memory                 # peak memory of the streamed pipeline
+    python3 bench_jobs.py pipeline --output after.json --compare before.json
+    python3 bench_jobs.py --write-fixtures       # regenerate fixtures/*.html
+    python3 bench_jobs.py --serve --port 8765    # stand-in server for jobs.py
+    python3 bench_jobs.py --serve-notify         # stand-in webhook/SendGrid/SMTP endpoints
+
+Recording real pages:
+    JOBS_RECORD_DIR=fixtures/recorded python3 jobs.py
+    python3 bench_jobs.py pipeline --fixtures fixtures/recorded
+
+Running jobs.py offline against the stand-in server:
+    INDEED_BASE_URL=http://127.0.0.1:8765 LINKEDIN_BASE_URL=http://127.0.0.1:8765 python3 jobs.py
+"""
+
+import argparse
+import glob
+import hashlib
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import socketserver
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jobs
+
+# ============================================
+# SYNTHETIC DATA
+# ============================================
+
+FILLER_WORDS = [
+    "platform", "maintain", "html", "customers", "growth", "deliver", "product",
+    "roadmap", "quality", "cloud", "stakeholders", "hiring", "architecture",
+    "scalable", "services", "agile", "culture", "ownership", "strategy", "data",
+]
+
+def make_description(rng, words):
+    """Build a job description of `words` words with a sprinkling of keywords"""
+    keywords = jobs.REQUIRED_SKILLS + jobs.NICE_TO_HAVE + jobs.LEADERSHIP_KEYWORDS
+    return " ".join(
+        rng.choice(keywords) if rng.random() < 0.02 else rng.choice(FILLER_WORDS)
+        for _ in range(words)
+    )
+
+def make_jobs(count, words, seed=42):
+    """Synthetic job dicts shaped like the scrapers' output"""
+    rng = random.Random(seed)
+    return [
+        {
+            'title': rng.choice(jobs.JOB_TITLES),
+            'description': make_description(rng, words),
+        }
+        for _ in range(count)
+    ]
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def make_indeed_card(rng, i):
+    """One Indeed result card, with the wrapper markup the real page carries"""
+    return f"""
+<li class="css-5lfssm eu4oa1w0"><div class="cardOutline tapItem dd-privacy-allow result job_{i:x} resultWithShelf">
+<div class="slider_container css-12igfu4 eu4oa1w0"><div class="slider_list css-1dbcbes eu4oa1w0"><div class="slider_item css-17bghu4 eu4oa1w0">
+<div class="job_seen_beacon"><table class="mainContentTable css-131ju4w eu4oa1w0" cellpadding="0" cellspacing="0" role="presentation"><tbody><tr><td class="resultContent css-1qwrrf0 eu4oa1w0">
+<div class="css-dekpa eu4oa1w0"><h2 class="jobTitle css-198pbd eu4oa1w0" tabindex="-1"><a id="job_{i:x}" data-jk="{rng.getrandbits(64):016x}" role="button" class="jcs-JobTitle css-1baag51 eu4oa1w0" href="/rc/clk?jk={i:x}"><span title="{rng.choice(jobs.JOB_TITLES)}">{rng.choice(jobs.JOB_TITLES)}</span></a></h2></div>
+<div class="company_location css-i375s1 e37uo190"><div class="css-1afmp4o e37uo190"><span data-testid="company-name" class="css-1h7lukg eu4oa1w0">Company {i}</span>
+<div data-testid="text-location" class="css-1restlb eu4oa1w0">Remote in Orlando, FL</div></div></div>
+<div class="heading6 tapItem-gutter metadataContainer css-z5ecg7 eym8bgm0"><div class="metadata salary-snippet-container css-1f4kgma eu4oa1w0"><div data-testid="attribute_snippet_testid" class="css-1rqpxry e1xnxm2i0">$180,000 - $220,000 a year</div></div></div>
+</td></tr></tbody></table><table class="jobCardShelfContainer big6_visualChanges" role="presentation"><tbody><tr class="underShelfFooter"><td>
+<div class="heading6 error-text tapItem-gutter"><div class="job-snippet"><ul style="list-style-type:circle;margin-top: 0px;margin-bottom: 0px;padding-left:20px;">
+<li>{make_description(rng, 25)}</li><li>{make_description(rng, 20)}</li></ul></div></div></td></tr></tbody></table></div>
+</div></div></div></div></li>"""
+
+def make_linkedin_card(rng, i):
+    """One LinkedIn guest search result card"""
+    job_id = rng.randrange(3_000_000_000, 4_000_000_000)
+    title = rng.choice(jobs.JOB_TITLES)
+    return f"""
+<li><div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{i}" data-reference-id="{rng.getrandbits(64):x}" data-tracking-id="{rng.getrandbits(64):x}" data-column="1" data-row="{i + 1}">
+<a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="https://www.linkedin.com/jobs/view/{title.lower().replace(' ', '-')}-at-company-{i}-{job_id}?position={i + 1}&amp;pageNum=0&amp;refId=x&amp;trackingId=y" data-tracking-control-name="public_jobs_jserp-result_search-card" data-tracking-will-navigate><span class="sr-only">{title}</span></a>
+<div class="search-entity-media"><img class="artdeco-entity-image artdeco-entity-image--square-4" data-delayed-url="https://media.licdn.com/dms/image/{rng.getrandbits(64):x}" alt="Company {i}"></div>
+<div class="base-search-card__info"><h3 class="base-search-card__title">{title}</h3>
+<h4 class="base-search-card__subtitle"><a class="hidden-nested-link" data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle" href="https://www.linkedin.com/company/company-{i}">Company {i}</a></h4>
+<div class="base-search-card__metadata"><span class="job-search-card__location">Orlando, FL</span>
+<div class="job-posting-benefits text-sm"><icon class="job-posting-benefits__icon" data-svg-class-name="job-posting-benefits__icon-svg"></icon><span class="job-posting-benefits__text">Actively Hiring</span></div>
+<time class="job-search-card__listdate" datetime="2025-11-2{i % 8}">{i % 7 + 1} days ago</time></div></div></div></li>"""
+
+def make_results_page(rng, source, cards, noise_kb):
+    """A results page: `cards` job cards surrounded by ~noise_kb of scripts and chrome"""
+    make_card = make_indeed_card if source == 'Indeed' else make_linkedin_card
+    state = {"jobs": [{"id": rng.getrandbits(64), "snippet": make_description(rng, 40)} for _ in range(noise_kb * 3)]}
+    nav = "".join(f'<li class="nav-item"><a class="nav-link" href="/q-{w}">{w.title()} jobs</a></li>' for w in FILLER_WORDS * 10)
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{source} results</title>
+<script>window.mosaic = {{"providerData": {json.dumps(state)}}};</script></head>
+<body><header><nav><ul>{nav}</ul></nav></header>
+<main><ul class="jobs-search__results-list">{"".join(make_card(rng, i) for i in range(cards))}</ul></main>
+<footer><ul>{nav}</ul></footer></body></html>"""
+
+POSTING_FIXTURE = "posting_linkedin.html"  # Served for LinkedIn job detail requests
+
+def make_linkedin_posting(rng):
+    """A LinkedIn guest job posting page with a full description"""
+    paragraphs = "".join(f"<p>{make_description(rng, 80)}</p>" for _ in range(4))
+    return f"""<section class="decorated-job-posting__details">
+<section class="core-section-container description"><div class="core-section-container__content">
+<div class="description__text description__text--rich"><section class="show-more-less-html">
+<div class="show-more-less-html__markup">{paragraphs}</div>
+</section></div></div></section></section>"""
+
+def write_fixtures():
+    """Regenerate the synthetic fixture pages used by the parsing benchmark and replay server"""
+    rng = random.Random(7)
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for source, cards in (('Indeed', 15), ('LinkedIn', 25)):
+        path = os.path.join(FIXTURES_DIR, f"{source.lower()}_results.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_results_page(rng, source, cards, noise_kb=60))
+        print(f"✅ Wrote {path}")
+    path = os.path.join(FIXTURES_DIR, POSTING_FIXTURE)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(make_linkedin_posting(rng))
+    print(f"✅ Wrote {path}")
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """Saved results pages as (source, name, bytes), source taken from the file name prefix"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        name = os.path.basename(path)
+        source = next((s for s in jobs.CARD_SELECTORS if name.lower().startswith(s.lower())), None)
+        if source:
+            with open(path, 'rb') as f:
+                fixtures.append((source, name, f.read()))
+    return fixtures
+
+def timed(func, *args):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+# ============================================
+# SCORING
+# ============================================
+
+def legacy_match_score(job_title, job_description):
+    """The original substring-scan scorer, kept as the 'before' baseline"""
+    score = 0
+    text = f"{job_title} {job_description}".lower()
+    for skill in jobs.REQUIRED_SKILLS:
+        if skill.lower() in text:
+            score += 10
+    for skill in jobs.NICE_TO_HAVE:
+        if skill.lower() in text:
+            score += 5
+    for keyword in ["lead", "manage", "director", "mentor", "team"]:
+        if keyword in text:
+            score += 3
+    return min(score, 100)
+
+def bench_scoring(args):
+    """Jobs scored per second: legacy substring loops vs compiled SkillMatcher vs batch RelevanceScorer"""
+    sample = make_jobs(args.jobs, args.words)
+
+    legacy, legacy_secs = timed(lambda: [legacy_match_score(j['title'], j['description']) for j in sample])
+    scores, matcher_secs = timed(jobs.SKILL_MATCHER.score_many, sample)
+    _, relevance_secs = timed(jobs.RELEVANCE_SCORER.score_many, sample)
+    changed = sum(1 for old, new in zip(legacy, scores) if old != new)
+
+    print(f"Scoring {args.jobs} jobs x {args.words} words")
+    print(f"  - legacy substring scan: {args.jobs / legacy_secs:,.0f} jobs/s")
+    print(f"  - SkillMatcher:          {args.jobs / matcher_secs:,.0f} jobs/s")
+    print(f"  - speedup:               {legacy_secs / matcher_secs:.2f}x")
+    print(f"  - scores changed:        {changed} (substring false hits such as 'ai' in 'maintain')")
+    print(f"  - RelevanceScorer ({jobs.RELEVANCE_SCORER.backend}): {args.jobs / relevance_secs:,.0f} jobs/s "
+          f"({relevance_secs:.3f}s for the batch)")
+
+# ============================================
+# PARSING
+# ============================================
+
+PARSE_BACKENDS = [
+    ('html.parser', False),
+    ('html.parser', True),
+    ('lxml', False),
+    ('lxml', True),
+]
+
+def bench_parsing(args):
+    """Card extraction time and retained memory per parser backend on the saved fixtures"""
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No fixture pages in {args.fixtures} (run with --write-fixtures)")
+        return
+
+    original = (jobs.PARSER_BACKEND, jobs.PARSE_ONLY_CARDS)
+    try:
+        for source, name, content in fixtures:
+            print(f"Parsing {name} ({len(content) / 1024:,.0f} KB) x {args.repeat}")
+            baseline = None
+            for parser, only_cards in PARSE_BACKENDS:
+                if jobs._resolve_html_parser(parser) != parser:
+                    continue
+                jobs.PARSER_BACKEND, jobs.PARSE_ONLY_CARDS = parser, only_cards
+
+                _, secs = timed(lambda: [jobs.extract_cards(source, content) for _ in range(args.repeat)])
+                # Extracted elements keep their whole parse tree alive, so measure what they retain
+                tracemalloc.start()
+                cards = jobs.extract_cards(source, content)
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del cards
+
+                per_page = secs / args.repeat
+                baseline = baseline or per_page
+                label = f"{parser}{' + SoupStrainer' if only_cards else ''}"
+                print(f"  - {label:<28} {per_page * 1000:8.2f} ms/page  {baseline / per_page:5.2f}x  "
+                      f"retained {retained / 1024:8,.0f} KB  peak {peak / 1024:8,.0f} KB")
+    finally:
+        jobs.PARSER_BACKEND, jobs.PARSE_ONLY_CARDS = original
+
+# ============================================
+# REPLAY SERVER
+# ============================================
+
+def source_for_path(path):
+    """Which job board a request path belongs to"""
+    if path.startswith(('/jobs/search', '/jobs-guest')):
+        return 'LinkedIn'
+    if path.startswith('/jobs'):
+        return 'Indeed'
+    return None
+
+class ReplayServer:
+    """Local stand-in for Indeed and LinkedIn that serves fixture pages.
+
+    Pages recorded with JOBS_RECORD_DIR are served for the exact path and
+    query they were recorded under (with their ETag, so conditional requests
+    get a 304). Any other search request is answered with one of the
+    fixture pages for that source, in rotation, so queries and pages that
+    were never recorded still get realistic content; LinkedIn job detail
+    requests get the posting fixture. Every response is delayed by
+    `latency` seconds.
+    """
+
+    def __init__(self, directory, latency=0.0, port=0):
+        self.latency = latency
+        self.exact = {}
+        self.by_source = {source: [] for source in jobs.CARD_SELECTORS}
+
+        manifest_path = os.path.join(directory, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                for url, entry in json.load(f).items():
+                    with open(os.path.join(directory, entry['file']), 'rb') as page:
+                        body = page.read()
+                    parts = url.split('/', 3)
+                    self.exact['/' + (parts[3] if len(parts) > 3 else '')] = (entry['status'], entry['headers'], body)
+        for source, _, body in load_fixtures(directory):
+            headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': f'"{hashlib.sha1(body).hexdigest()}"'}
+            self.by_source[source].append((200, headers, body))
+        self._rotation = {source: itertools.cycle(pages) for source, pages in self.by_source.items() if pages}
+        self.posting = None
+        posting_path = os.path.join(directory, POSTING_FIXTURE)
+        if os.path.exists(posting_path):
+            with open(posting_path, 'rb') as f:
+                self.posting = (200, {'Content-Type': 'text/html; charset=utf-8'}, f.read())
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                status, headers, body = server.lookup(self.path)
+                if status == 200 and headers.get('ETag') and self.headers.get('If-None-Match') == headers['ETag']:
+                    status, body = 304, b""
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def lookup(self, path):
+        """(status, headers, body) for a request path"""
+        if path in self.exact:
+            return self.exact[path]
+        if path.startswith('/jobs-guest/jobs/api/jobPosting/') and self.posting:
+            return self.posting
+        source = source_for_path(path)
+        with self._lock:
+            if source in self._rotation:
+                return next(self._rotation[source])
+        return 404, {'Content-Type': 'text/plain'}, b"no fixture for this path"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def serve(args):
+    """Run the replay server in the foreground"""
+    with ReplayServer(args.fixtures, args.latency, args.port) as server:
+        print(f"Serving fixtures from {args.fixtures} at {server.url} (latency {args.latency}s), Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+# ============================================
+# NOTIFICATION STAND-IN
+# ============================================
+
+class NotifyStandIn:
+    """Local webhook/SendGrid (HTTP) and SMTP endpoints that record what jobs.py delivers.
+
+    The first `failures` HTTP requests get a 503, to exercise the outbox's retries.
+    """
+
+    def __init__(self, failures=0, port=0, smtp_port=0):
+        self.failures = failures
+        self.received = []
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class HttpHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with stand_in._lock:
+                    failing = stand_in.failures > 0
+                    if failing:
+                        stand_in.failures -= 1
+                    else:
+                        stand_in.received.append(('http', self.path, json.loads(body or b'null')))
+                self.send_response(503 if failing else 202)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        class SmtpHandler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line + b"\r\n")
+
+            def handle(self):
+                self.reply(b"220 bench_jobs stand-in ESMTP")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line[:4].upper()
+                    if command == b"DATA":
+                        self.reply(b"354 End data with <CR><LF>.<CR><LF>")
+                        data = []
+                        for data_line in iter(self.rfile.readline, b""):
+                            if data_line.rstrip(b"\r\n") == b".":
+                                break
+                            data.append(data_line)
+                        with stand_in._lock:
+                            stand_in.received.append(('smtp', None, b"".join(data).decode('utf-8', 'replace')))
+                        self.reply(b"250 OK")
+                    elif command == b"QUIT":
+                        self.reply(b"221 Bye")
+                        return
+                    else:
+                        self.reply(b"250 OK")
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), HttpHandler)
+        self.httpd.daemon_threads = True
+        self.smtpd = socketserver.ThreadingTCPServer(('127.0.0.1', smtp_port), SmtpHandler)
+        self.smtpd.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def smtp_port(self):
+        return self.smtpd.server_address[1]
+
+    def configure(self, directory):
+        """Point every jobs.py notifier except desktop at this stand-in"""
+        jobs.NOTIFY_WEBHOOK_URL = f"{self.url}/webhook"
+        jobs.SENDGRID_API_URL, jobs.SENDGRID_API_KEY = f"{self.url}/v3/mail/send", "bench"
+        jobs.SMTP_HOST, jobs.SMTP_PORT, jobs.SMTP_STARTTLS = '127.0.0.1', self.smtp_port, False
+        jobs.SENDER_EMAIL, jobs.RECIPIENT_EMAIL = "jobs@localhost", "me@localhost"
+        jobs.NOTIFY_FILE = os.path.join(directory, "notifications.jsonl")
+        return ['file', 'webhook', 'sendgrid', 'smtp']
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        threading.Thread(target=self.smtpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        for server in (self.httpd, self.smtpd):
+            server.shutdown()
+            server.server_close()
+
+def bench_notify(args):
+    """Enqueue cost on the run's critical path vs. background delivery time, all channels"""
+    original = {name: getattr(jobs, name) for name in (
+        'NOTIFY_WEBHOOK_URL', 'SENDGRID_API_URL', 'SENDGRID_API_KEY', 'SMTP_HOST', 'SMTP_PORT',
+        'SMTP_STARTTLS', 'SENDER_EMAIL', 'RECIPIENT_EMAIL', 'NOTIFY_FILE', 'NOTIFY_BATCH_SECONDS')}
+    runs = 20
+    try:
+        with tempfile.TemporaryDirectory() as tmp, NotifyStandIn() as stand_in:
+            channels = stand_in.configure(tmp)
+            jobs.NOTIFY_BATCH_SECONDS = 0
+            outbox = jobs.NotificationOutbox(os.path.join(tmp, "outbox.db"), channels)
+            outbox.start()
+            samples = [make_scraped_jobs(50, seed) for seed in range(runs)]
+            start = time.perf_counter()
+            for sample in samples:
+                outbox.enqueue(sample)
+            enqueue_secs = time.perf_counter() - start
+            outbox.close(timeout=60)
+            total_secs = time.perf_counter() - start
+    finally:
+        for name, value in original.items():
+            setattr(jobs, name, value)
+    print(f"Notifications ({runs} batches of 50 jobs, {len(channels)} channels)")
+    print(f"  - enqueue (critical path)  {enqueue_secs / runs * 1000:8.2f} ms/batch")
+    print(f"  - delivered in background  {total_secs:8.3f}s total, {len(stand_in.received)} requests/emails")
+
+def serve_notify(args):
+    """Run the notification stand-in in the foreground, printing what arrives"""
+    with NotifyStandIn(port=args.port, smtp_port=args.port + 1) as stand_in:
+        print(f"Notification stand-in: webhook/SendGrid at {stand_in.url}, SMTP at 127.0.0.1:{stand_in.smtp_port}")
+        print(f"  JOBS_NOTIFIERS=webhook,sendgrid,smtp JOBS_WEBHOOK_URL={stand_in.url}/webhook "
+              f"SENDGRID_API_URL={stand_in.url}/v3/mail/send SMTP_HOST=127.0.0.1 SMTP_PORT={stand_in.smtp_port} "
+              f"SMTP_STARTTLS=0 python3 jobs.py")
+        seen = 0
+        try:
+            while True:
+                time.sleep(0.5)
+                for kind, path, body in stand_in.received[seen:]:
+                    print(f"[{kind}] {path or ''} {json.dumps(body)[:200] if kind == 'http' else body.splitlines()[0:4]}")
+                seen = len(stand_in.received)
+        except KeyboardInterrupt:
+            pass
+
+# ============================================
+# MEMORY
+# ============================================
+
+JOBS_PER_QUERY = 100
+KNOWN_RATIO = 0.9  # Steady state: most of each query's results were reported in earlier runs
+
+def make_query_chunks(queries, seed=42):
+    """(key, jobs) chunks shaped like stream_queries() output, with unique job IDs"""
+    for q in range(queries):
+        sample = make_scraped_jobs(JOBS_PER_QUERY, seed + q)
+        for i, job in enumerate(sample):
+            job.job_id = f"indeed_{q}_{i}"
+        yield (f"Query {q}", 'Indeed'), sample
+
+def traced_peak(run):
+    """Peak traced memory, in bytes, while run() executes"""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_memory(args):
+    """Peak memory of the streamed stages vs collecting every query first, and Job records vs dicts"""
+    def streamed(store, queries):
+        deduper = jobs.RunDeduper(store)
+        for _ in jobs.dedup_stage(jobs.score_stage(make_query_chunks(queries)), deduper):
+            pass
+        deduper.finish()
+
+    def collected(store, queries):
+        all_jobs = [job for _, chunk in make_query_chunks(queries) for job in chunk]
+        jobs.score_jobs(all_jobs)
+        jobs.dedup_jobs(all_jobs, store)
+
+    print(f"Peak memory, {JOBS_PER_QUERY} jobs per query, {KNOWN_RATIO:.0%} already reported")
+    for queries in (10, 40, 160):
+        peaks = []
+        for run in (streamed, collected):
+            with tempfile.TemporaryDirectory() as tmp:
+                store = jobs.SeenStore(os.path.join(tmp, "seen.db"), jobs.SEEN_JOBS_TTL_DAYS)
+                store.claim({f"indeed_{q}_{i}" for q in range(queries)
+                             for i in range(int(JOBS_PER_QUERY * KNOWN_RATIO))})
+                peaks.append(traced_peak(lambda: run(store, queries)))
+                store.close()
+        print(f"  - {queries:>4} queries: streamed {peaks[0] / 1024:8,.0f} KB   "
+              f"collected first {peaks[1] / 1024:8,.0f} KB")
+
+    # As loaded from the HTTP cache or run journal: every string is a fresh object
+    payload = json.dumps([job.to_dict() for job in make_scraped_jobs(args.jobs)])
+    retained = []
+    for load in (json.loads, lambda text: [jobs.Job.from_dict(job) for job in json.loads(text)]):
+        tracemalloc.start()
+        loaded = load(payload)
+        retained.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del loaded
+    print(f"{args.jobs} jobs loaded from JSON: dicts {retained[0] / 1024:,.0f} KB, "
+          f"Job records {retained[1] / 1024:,.0f} KB")
+
+# ============================================
+# PIPELINE SUITE
+# ============================================
+
+CARDS_PER_PAGE = 20  # rough average of Indeed (15) and LinkedIn (25) pages
+
+def pages_for(size, max_pages):
+    """Results pages needed for `size` jobs, capped at max_pages"""
+    return max(1, min(math.ceil(size / CARDS_PER_PAGE), max_pages))
+
+def stage_fetch(args, size, server):
+    """Fetch results pages from the replay server with the real client and thread pool"""
+    client = jobs.HttpClient(jobs.HostRateLimiter(0))
+    builders = [jobs.indeed_search_url, jobs.linkedin_search_url]
+    urls = [builders[i % 2](jobs.JOB_TITLES[i % len(jobs.JOB_TITLES)], i // 2)
+            for i in range(pages_for(size, args.max_pages))]
+    with ThreadPoolExecutor(max_workers=jobs.MAX_WORKERS) as executor:
+        start = time.perf_counter()
+        responses = list(executor.map(client.get, urls))
+        secs = time.perf_counter() - start
+    return len(responses), 'pages', secs
+
+def stage_parse(args, size, server):
+    """Extract jobs from fixture pages with the scrapers' page parsers"""
+    fixtures = load_fixtures(args.fixtures)
+    pages = [fixtures[i % len(fixtures)] for i in range(pages_for(size, args.max_pages))]
+    start = time.perf_counter()
+    parsed = sum(len(jobs.parse(source, content)) for source, _, content in pages)
+    return parsed, 'jobs', time.perf_counter() - start
+
+def stage_parse_pool(args, size, server):
+    """The same pages parsed through the process pool by MAX_WORKERS fetch threads"""
+    fixtures = load_fixtures(args.fixtures)
+    pages = [fixtures[i % len(fixtures)] for i in range(pages_for(size, args.max_pages))]
+    pool = jobs.ParsePool(jobs.PARSE_WORKERS, jobs.PARSE_QUEUE_SIZE)
+    pool.start()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs.MAX_WORKERS) as executor:
+            start = time.perf_counter()
+            parsed = sum(len(result[0]) for result in executor.map(lambda page: pool.parse(page[0], page[2]), pages))
+            secs = time.perf_counter() - start
+    finally:
+        pool.close()
+    return parsed, 'jobs', secs
+
+def stage_score(args, size, server):
+    """Score snippet-sized synthetic jobs in one batch"""
+    sample = make_jobs(size, 60)
+    _, secs = timed(jobs.score_jobs, sample)
+    return size, 'jobs', secs
+
+def make_scraped_jobs(size, seed=42):
+    """Scraper-shaped Job records with ~30% duplicate IDs"""
+    rng = random.Random(seed)
+    return [
+        jobs.Job(
+            title=job['title'],
+            company=f"Company {rng.randrange(size)}",
+            location=jobs.LOCATION,
+            url=f"https://www.indeed.com/viewjob?jk={i:x}",
+            description=job['description'][:300],
+            source=rng.choice(list(jobs.CARD_SELECTORS)),
+            match_score=rng.randrange(101),
+            job_id=f"indeed_{rng.randrange(int(size * 0.7) + 1):x}",
+        )
+        for i, job in enumerate(make_jobs(size, 60, seed))
+    ]
+
+def stage_dedup(args, size, server):
+    """main()'s dedup against a seen-store that already knows a third of the IDs"""
+    sample = make_scraped_jobs(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file, jobs.SENT_JOBS_FILE = jobs.SENT_JOBS_FILE, os.path.join(tmp, "sent_jobs.json")
+        try:
+            store = jobs.SeenStore(os.path.join(tmp, "seen.db"), jobs.SEEN_JOBS_TTL_DAYS,
+                                   jobs.FUZZY_DEDUP_THRESHOLD if jobs.FUZZY_DEDUP else None)
+            store.claim({job['job_id'] for job in sample[::3]})
+            _, secs = timed(jobs.dedup_jobs, sample, store)
+            store.close()
+        finally:
+            jobs.SENT_JOBS_FILE = legacy_file
+    return size, 'jobs', secs
+
+def stage_report(args, size, server):
+    """Write the HTML report for `size` sorted jobs"""
+    sample = sorted(make_scraped_jobs(size), key=lambda job: job['match_score'], reverse=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = jobs.HtmlReportWriter(os.path.join(tmp, "latest_jobs.html"), jobs.REPORT_JOBS_PER_PAGE)
+        start = time.perf_counter()
+        for job in sample:
+            writer.add(job)
+        writer.close()
+        secs = time.perf_counter() - start
+    return size, 'jobs', secs
+
+def stage_archive(args, size, server):
+    """Archive `size` jobs in batches, then run one full-text query with filters"""
+    sample = make_scraped_jobs(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = jobs.JobArchive(os.path.join(tmp, "job_archive.db"))
+        start = time.perf_counter()
+        archive.add_many(sample)
+        archive.search("react director", days=30, min_score=60)
+        secs = time.perf_counter() - start
+        archive.close()
+    return size, 'jobs', secs
+
+PIPELINE_STAGES = {
+    'fetch': stage_fetch,
+    'parse': stage_parse,
+    'parse-pool': stage_parse_pool,
+    'score': stage_score,
+    'dedup': stage_dedup,
+    'report': stage_report,
+    'archive': stage_archive,
+}
+
+def git_revision():
+    """Current commit of the working tree, if available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare_results(results, baseline_path, threshold):
+    """Print per-stage throughput change against a previous results file"""
+    with open(baseline_path, 'r') as f:
+        baseline = {(r['stage'], r['size']): r for r in json.load(f)['results']}
+    print(f"Compared with {baseline_path} (regression threshold {threshold:.0%}):")
+    regressions = 0
+    for result in results:
+        old = baseline.get((result['stage'], result['size']))
+        if not old or not old['per_sec']:
+            continue
+        change = result['per_sec'] / old['per_sec'] - 1
+        flag = "⚠️  regression" if change < -threshold else ""
+        regressions += bool(flag)
+        print(f"  - {result['stage']:<7} {result['size']:>7}: {change:+7.1%} {flag}")
+    print(f"  {regressions} regression(s)")
+
+def bench_pipeline(args):
+    """Time each pipeline stage separately at every requested size"""
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = []
+    rate_limit = jobs.RATE_LIMITER.min_interval
+    base_urls = (jobs.INDEED_BASE_URL, jobs.LINKEDIN_BASE_URL)
+    with ReplayServer(args.fixtures, args.latency) as server:
+        jobs.INDEED_BASE_URL = jobs.LINKEDIN_BASE_URL = server.url
+        jobs.RATE_LIMITER.min_interval = 0
+        try:
+            print(f"Pipeline stages (replay latency {args.latency}s, fetch/parse capped at {args.max_pages} pages)")
+            for stage, run in PIPELINE_STAGES.items():
+                for size in sizes:
+                    # Best of several rounds for the small, noisy sizes
+                    rounds = args.rounds if size < 10000 else 1
+                    items, unit, secs = min((run(args, size, server) for _ in range(rounds)), key=lambda r: r[2])
+                    result = {'stage': stage, 'size': size, 'items': items, 'unit': unit,
+                              'seconds': secs, 'per_sec': items / secs if secs else 0.0}
+                    results.append(result)
+                    print(f"  - {stage:<10} {size:>7}: {items:>7} {unit:<5} in {secs:8.3f}s  "
+                          f"{result['per_sec']:>12,.0f} {unit}/s")
+        finally:
+            jobs.INDEED_BASE_URL, jobs.LINKEDIN_BASE_URL = base_urls
+            jobs.RATE_LIMITER.min_interval = rate_limit
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'revision': git_revision(),
+                    'python': platform.python_version(),
+                    'parser': jobs.PARSER_BACKEND,
+                    'latency': args.latency,
+                    'max_pages': args.max_pages,
+                },
+                'results': results,
+            }, f, indent=2)
+        print(f"✅ Saved results to {args.output}")
+    if args.compare:
+        compare_results(results, args.compare, args.threshold)
+
+# ============================================
+# MAIN
+# ============================================
+
+BENCHMARKS = {
+    'scoring': bench_scoring,
+    'parsing': bench_parsing,
+    'pipeline': bench_pipeline,
+    'notify': bench_notify,
+    'memory': bench_memory,
+}
+
+def main():
+    """Parse arguments and run the selected benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('benchmarks', nargs='*', help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--jobs', type=int, default=2000, help="synthetic jobs per benchmark")
+    parser.add_argument('--words', type=int, default=1500, help="words per synthetic description")
+    parser.add_argument('--repeat', type=int, default=20, help="parses per fixture page")
+    parser.add_argument('--write-fixtures', action='store_true', help="regenerate fixtures/*.html and exit")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="fixture directory (synthetic or recorded)")
+    parser.add_argument('--sizes', default="10,100,1000,10000,100000", help="pipeline sizes, in jobs")
+    parser.add_argument('--max-pages', type=int, default=200, help="page cap for the fetch and parse stages")
+    parser.add_argument('--latency', type=float, default=0.05, help="replay server latency in seconds")
+    parser.add_argument('--rounds', type=int, default=3, help="best-of rounds for pipeline sizes under 10k")
+    parser.add_argument('--output', help="save pipeline results as JSON")
+    parser.add_argument('--compare', help="pipeline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="slowdown flagged as a regression")
+    parser.add_argument('--serve', action='store_true', help="run the replay server until interrupted")
+    parser.add_argument('--port', type=int, default=8765, help="replay server port for --serve")
+    parser.add_argument('--serve-notify', action='store_true',
+                        help="run the webhook/SendGrid/SMTP stand-in (--port, SMTP on --port + 1) until interrupted")
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    if args.write_fixtures:
+        write_fixtures()
+        return
+    if args.serve:
+        serve(args)
+        return
+    if args.serve_notify:
+        serve_notify(args)
+        return
+
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,45 @@ Sends desktop notifications and creates local HTML file for viewing
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import json
+import sys
+import itertools
 from datetime import datetime, timedelta
 import time
 import os
 from urllib.parse import quote_plus
 import re
+import random
+import hashlib
+import math
+import sqlite3
 import subprocess
+import tempfile
+import argparse
+import cProfile
+import pstats
+from contextlib import contextmanager
+from html import escape
+from string import Template
+import threading
+import signal
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
+import email.utils
+from email.message import EmailMessage
+import smtplib
+import shutil
+import socket
+import fcntl
+from queue import SimpleQueue
+
+try:
+    import numpy as np  # Optional: vectorized batch scoring (falls back to pure Python)
+except ImportError:
+    np = None
 
 # ============================================
 # CONFIGURATION - UPDATE THESE VALUES
@@ -21,6 +52,31 @@ import subprocess
 
 # Output Configuration
 JOBS_HTML_FILE = os.path.join(os.path.dirname(__file__), "latest_jobs.html")
+REPORT_JOBS_PER_PAGE = 100  # Larger reports are split into latest_jobs_2.html, ...
+OPEN_REPORT = True  # Open the report in the browser after each run
+REPORT_BROWSER = "Google Chrome"  # macOS app to open it with (falls back to the default browser)
+
+# Notifications: queued in NOTIFY_OUTBOX_DB and sent by a background thread, so a slow or
+# failing channel never holds up a run. Channels: desktop, file, webhook, smtp, sendgrid
+NOTIFIERS = [name.strip() for name in os.environ.get("JOBS_NOTIFIERS", "desktop").split(",") if name.strip()]
+NOTIFY_OUTBOX_DB = "notify_outbox.db"
+NOTIFY_BATCH_SECONDS = 60  # Notifications queued this close together go out as one
+NOTIFY_FLUSH_SECONDS = 30  # A finishing run waits this long for delivery; the rest goes out next run
+NOTIFY_RETRY_SECONDS = 60  # First retry delay, doubled after every failed attempt
+NOTIFY_MAX_ATTEMPTS = 6
+NOTIFY_MAX_AGE_DAYS = 7  # Queued notifications older than this are dropped
+NOTIFY_MAX_LISTED = 25  # Jobs listed in an email or file notification
+NOTIFY_FILE = os.environ.get("JOBS_NOTIFY_FILE", os.path.join(os.path.dirname(__file__), "notifications.jsonl"))
+NOTIFY_WEBHOOK_URL = os.environ.get("JOBS_WEBHOOK_URL")
+SMTP_HOST = os.environ.get("SMTP_HOST")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_USER = os.environ.get("SMTP_USER")
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD")
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "1") != "0"
+SENDGRID_API_KEY = os.environ.get("SENDGRID_API_KEY")
+SENDGRID_API_URL = os.environ.get("SENDGRID_API_URL", "https://api.sendgrid.com/v3/mail/send")
+SENDER_EMAIL = os.environ.get("SENDER_EMAIL")
+RECIPIENT_EMAIL = os.environ.get("RECIPIENT_EMAIL")
 
 # Job Search Configuration
 LOCATION = "Winter Springs, FL"
@@ -43,16 +99,180 @@ NICE_TO_HAVE = [
     "Python", "GCP", "AWS", "MongoDB"
 ]
 
+# Matched as word stems, e.g. "lead" also matches "leader" and "leadership"
+LEADERSHIP_KEYWORDS = ["lead", "manage", "director", "mentor", "team"]
+
+# HTML Parsing Configuration
+HTML_PARSER = "lxml"  # "lxml" (faster, needs `pip install lxml`) or "html.parser"
+PARSE_ONLY_CARDS = True  # Only build the parse tree for job cards (SoupStrainer)
+
+# Match score weights (points per keyword found)
+REQUIRED_SKILL_POINTS = 10
+NICE_TO_HAVE_POINTS = 5
+LEADERSHIP_POINTS = 3
+
+# Relevance scoring: BM25 weights over title + description against the skills profile above
+SCORING_ENGINE = "relevance"  # "relevance" (weighted by term frequency and rarity) or "keywords" (flat points, capped)
+RESUME_FILE = os.environ.get("JOBS_RESUME_FILE")  # Optional plain-text resume whose terms join the profile
+RESUME_TERM_POINTS = 1.0  # Profile weight of each resume term
+TITLE_TERM_WEIGHT = 2.0  # A term in the job title counts as this many occurrences
+RELEVANCE_SCALE = 60.0  # Raw points at which the score reaches 63%; scores approach 100 smoothly
+BM25_K1 = 1.2
+BM25_B = 0.75
+TERM_STATS_FILE = "term_stats.json"  # How often each profile term appears in postings, learned across runs
+
 JOB_TYPE = "remote"  # Can be: remote, full-time, contract
 POSTED_WITHIN_DAYS = 7  # Only jobs posted within last 7 days
 
-# File to track already-sent jobs (prevents duplicates)
-SENT_JOBS_FILE = "sent_jobs.json"
+# Seen-jobs store (prevents duplicate notifications)
+SEEN_JOBS_DB = "seen_jobs.db"
+SEEN_JOBS_TTL_DAYS = 90  # Forget jobs that haven't shown up in search results for this long
+SENT_JOBS_FILE = "sent_jobs.json"  # Legacy ID list, imported into SEEN_JOBS_DB on first use
+
+# Run journal: finished queries are checkpointed so `--resume` can pick up after a crash
+RUN_JOURNAL_FILE = "run_journal.jsonl"
+RESUME_WINDOW_MINUTES = 120  # Checkpoints older than this are fetched again
+
+# Archive of every parsed job, full-text searchable with: python3 jobs.py --search "react director"
+ARCHIVE_JOBS = True
+JOB_ARCHIVE_DB = "job_archive.db"
+ARCHIVE_BATCH_SIZE = 500  # Rows per insert transaction
+
+# Duplicate detection (same job on several sources, or reposted under a new ID)
+FUZZY_DEDUP = True  # Also merge near-identical titles at the same company and location
+FUZZY_DEDUP_THRESHOLD = 0.75  # Estimated title similarity (0-1) needed to count as the same job, at the same level
+
+# Concurrency Configuration
+MAX_WORKERS = 8  # (title, source) searches running at once
+HOST_MIN_INTERVAL = 2.0  # seconds between requests to the same host, on average
+HOST_BURST = 2  # requests a host may get back to back after a quiet spell
+PARSE_WORKERS = os.cpu_count() or 1  # Processes parsing pages off the GIL (0 = parse in the fetch threads)
+PARSE_QUEUE_SIZE = 2 * PARSE_WORKERS  # Pages queued or being parsed; fetchers wait when it's full
+
+# HTTP Client Configuration
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+CONNECT_TIMEOUT = 5  # seconds to establish a connection
+READ_TIMEOUT = 15  # seconds to wait for the response body
+MAX_RETRIES = 3  # extra attempts after the first one
+BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+BACKOFF_MAX = 30.0  # cap for a single backoff delay
+RETRY_STATUSES = {500, 502, 503, 504}  # 429 and 403 trip the circuit breaker instead
+POOL_MAXSIZE = MAX_WORKERS  # keep-alive connections per host
+
+# Circuit breaker: stop sending requests to a host that is blocking us
+BREAKER_STATE_FILE = "circuit_breaker.json"  # Kept across runs so cron doesn't hammer a blocked host
+BREAKER_STATUSES = {403, 429}
+BREAKER_TIMEOUT_STREAK = 3  # Consecutive timeouts/connection errors that open the circuit
+BREAKER_COOLDOWN_MINUTES = 30  # First cooldown without Retry-After; doubled on every trip in a row
+BREAKER_MAX_COOLDOWN_MINUTES = 24 * 60  # Also caps Retry-After
+# Bot-check pages served with a 200
+CHALLENGE_MARKERS = [b"challenge-platform", b"cf-chl-", b"<title>Just a moment...</title>",
+                     b"captcha-delivery.com", b"Additional Verification Required", b"/authwall"]
+
+# HTTP Response Cache Configuration
+HTTP_CACHE_DIR = "http_cache"
+HTTP_CACHE_TTL_MINUTES = 60  # Serve cached pages without revalidating for this long
+HTTP_CACHE_MAX_MB = 50  # Least recently used pages are evicted beyond this size
+
+# Search endpoints (override to point at the bench_jobs.py replay server)
+INDEED_BASE_URL = os.environ.get("INDEED_BASE_URL", "https://www.indeed.com")
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+
+# Record every fetched page as a replayable fixture (see bench_jobs.py)
+RECORD_DIR = os.environ.get("JOBS_RECORD_DIR")
+
+# Run metrics: a JSON file per run plus a Prometheus textfile (overwritten each run)
+METRICS_DIR = os.path.join(os.path.dirname(__file__), "metrics")
+METRICS_PROM_FILE = "jobs.prom"
+PROFILE_TOP_FUNCTIONS = 25  # Hot functions printed by --profile
+
+# LinkedIn description enrichment (search cards have no description, so they're scored on title alone)
+ENRICH_LINKEDIN = True
+ENRICH_MAX_JOBS = 25  # Job pages fetched per run at most, best title scores first
+ENRICH_WORKERS = 4  # Job pages fetched at once (still subject to HOST_MIN_INTERVAL)
+ENRICH_TITLE_KEYWORDS = ["engineering", "director", "manager", "vp", "head"]  # Skip titles with none of these
+
+# Query planner: learns which JOB_TITLES return the same jobs and searches them together
+QUERY_PLANNER = True
+QUERY_STATS_FILE = "query_stats.json"
+QUERY_COVERED_RATIO = 0.9  # Skip a title when this share of its results also come back for another title
+QUERY_MERGE_RATIO = 0.5  # OR titles together when their results overlap at least this much
+QUERY_MERGE_MAX_TITLES = 3
+QUERY_CALIBRATE_EVERY = 5  # Every Nth run searches each title separately to refresh the overlap stats
+QUERY_STATS_WEIGHT = 0.3  # Weight of the latest calibration run in the moving averages
+QUERY_OR_SYNTAX = {'Indeed': ' OR ', 'LinkedIn': ' OR '}  # Sources whose search accepts OR queries
+
+# Multi-profile mode (--profiles): one JSON file per person or search, see README
+PROFILES_DIR = os.path.join(os.path.dirname(__file__), "profiles")
+PROFILE_SHARE_MIN_SCORE = 40  # Jobs found by another profile's searches are shared at this score or above
+
+# Daemon mode (--daemon): each (title, source) query is polled on its own interval
+DAEMON_STATE_FILE = "daemon_state.json"
+DAEMON_START_INTERVAL_MINUTES = 120
+DAEMON_MIN_INTERVAL_MINUTES = 30
+DAEMON_MAX_INTERVAL_MINUTES = 12 * 60
+DAEMON_SPEEDUP = 0.5  # Interval multiplier after a poll that found new jobs
+DAEMON_BACKOFF = 1.5  # Interval multiplier after a quiet poll
+
+# Work-queue mode (--coordinator / --worker): results pages are fetched by worker processes, on this
+# machine or others sharing the queue file (it needs a filesystem with working file locks)
+WORK_QUEUE_DB = os.environ.get("JOBS_WORK_QUEUE", "work_queue.db")
+WORK_LEASE_SECONDS = 120  # A claimed page goes back on the queue if its worker hasn't finished by then
+WORK_MAX_ATTEMPTS = 3
+WORK_RETRY_SECONDS = 30  # Delay before a failed page can be claimed again
+WORK_POLL_SECONDS = 1.0
+WORK_STALL_MINUTES = 10  # The coordinator gives up when no page has come back for this long
+
+# Pagination Configuration
+MAX_PAGES_PER_QUERY = 3  # Hard page budget per (title, source) query
+SEEN_STOP_RATIO = 0.8  # Stop paging once this share of a page's jobs were already reported
 
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
+def _new_file_mode():
+    """Permissions open() gives a new file under the process umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+# mkstemp always creates files as 0600; written files get this instead
+NEW_FILE_MODE = _new_file_mode()
+
+@contextmanager
+def atomic_write(path, mode='w'):
+    """Write a file via a temp file in the same directory and an atomic rename.
+
+    Readers (and the next run, if this one is killed mid-write) see either
+    the old file or the complete new one, never a partial file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, NEW_FILE_MODE)
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path (via path.lock) against other processes, e.g. local workers"""
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 def load_sent_jobs():
     """Load previously sent job IDs to avoid duplicates"""
     if os.path.exists(SENT_JOBS_FILE):
@@ -60,181 +280,2175 @@ def load_sent_jobs():
             return json.load(f)
     return []
 
-def save_sent_jobs(job_ids):
-    """Save sent job IDs"""
-    with open(SENT_JOBS_FILE, 'w') as f:
-        json.dump(job_ids, f)
+class Job:
+    """One job posting: a slotted record instead of a dict per job.
+
+    A run holds thousands of postings that repeat the same few sources,
+    companies and locations, so those strings are interned (each distinct
+    value is stored once, including after a round trip through a parse
+    worker, the HTTP cache or the run journal) and records carry no
+    per-instance dict. Item access (job['title'], job.get('sources'))
+    works as it did on the dicts, so report, archive and notification
+    code takes either.
+    """
+
+    __slots__ = ('title', 'company', 'location', 'url', 'description', 'source', 'match_score', 'job_id',
+                 'fingerprint', 'sources')
+    _FIELDS = frozenset(__slots__)  # fingerprint and sources are only set on merged records
+
+    def __init__(self, title, company, location, url, description, source, match_score=0, job_id='',
+                 fingerprint=None, sources=None):
+        self.title = title
+        self.company = sys.intern(company)
+        self.location = sys.intern(location)
+        self.url = url
+        self.description = description
+        self.source = sys.intern(source)
+        self.match_score = match_score
+        self.job_id = job_id
+        self.fingerprint = fingerprint
+        self.sources = sources
+
+    @classmethod
+    def from_dict(cls, data):
+        """Record from a JSON-loaded dict, ignoring keys that aren't fields"""
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+
+    def to_dict(self):
+        """Plain dict of the fields that are set, for JSON"""
+        return {key: getattr(self, key) for key in self.__slots__ if getattr(self, key) is not None}
+
+    def copy(self, **changes):
+        """A new record with some fields replaced"""
+        fields = {key: getattr(self, key) for key in self.__slots__}
+        fields.update(changes)
+        return Job(**fields)
+
+    def __getitem__(self, key):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._FIELDS and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in self._FIELDS else None
+        return default if value is None else value
+
+    # Pickled as a dict so strings are interned again in the receiving process
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return f"Job({self.job_id!r}, {self.title!r} at {self.company!r})"
+
+# Normalization applied before fingerprinting, so "Sr. Eng Manager" at
+# "Acme, Inc." matches "Senior Engineering Manager" at "Acme"
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior', 'jr': 'junior', 'mgr': 'manager', 'eng': 'engineering', 'engr': 'engineer',
+    'dir': 'director', 'vp': 'vice president', 'svp': 'senior vice president', 'dev': 'developer',
+    'evp': 'executive vice president',
+}
+# Seniority words and level numbers: titles only count as near-duplicates when these agree,
+# since "Engineering Manager I"/"II" or "VP"/"SVP of Engineering" differ by a character or two
+TITLE_LEVEL_WORDS = {'junior', 'senior', 'staff', 'principal', 'lead', 'associate', 'assistant', 'executive'}
+ROMAN_LEVELS = {'i': '1', 'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6'}
+TITLE_NOISE_WORDS = {'remote', 'hybrid', 'onsite'}
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'plc', 'gmbh', 'limited', 'incorporated'}
+LOCATION_PREFIX = re.compile(r'^(?:(?:remote|hybrid|on-?site)(?: work)?(?: remote)? in )')
+
+def _words(text):
+    """Lowercase alphanumeric words of a string"""
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+def normalize_title(title):
+    """Title with abbreviations expanded and work-arrangement noise dropped"""
+    words = []
+    for word in _words(title):
+        if word not in TITLE_NOISE_WORDS:
+            words.extend(TITLE_ABBREVIATIONS.get(word, word).split())
+    return ' '.join(words)
+
+def normalize_company(company):
+    """Company name without legal suffixes"""
+    words = _words(company)
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def normalize_location(location):
+    """City part of a location ("Remote in Orlando, FL 32801" -> "orlando")"""
+    location = LOCATION_PREFIX.sub('', location.strip().lower())
+    return ' '.join(_words(location.split(',')[0]))
+
+def title_level(title_key):
+    """Seniority words and level numbers of a normalized title ("senior 2" for "Sr. Engineer II")"""
+    levels = set()
+    for word in title_key.split():
+        if word in TITLE_LEVEL_WORDS or word.isdigit():
+            levels.add(word)
+        elif word in ROMAN_LEVELS:
+            levels.add(ROMAN_LEVELS[word])
+    return ' '.join(sorted(levels))
+
+def dedup_keys(job):
+    """Return (fingerprint, block, title_key) for a job.
+
+    The fingerprint is shared by every posting with the same normalized
+    title, company and location; the block (company + location + title
+    level) limits fuzzy title matching to postings that could be the same job.
+    """
+    title = normalize_title(job['title'])
+    place = f"{normalize_company(job['company'])}|{normalize_location(job['location'])}"
+    fingerprint = hashlib.sha1(f"{title}|{place}".encode()).hexdigest()[:16]
+    return fingerprint, f"{place}|{title_level(title)}", title
+
+# MinHash signature of a title's character 3-grams, split into LSH bands
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4  # Values per band; BANDS * ROWS is the signature length
+_MINHASH_PRIME = (1 << 61) - 1
+
+def _minhash_permutations(count, seed=0):
+    """Fixed hash permutations, so signatures stored by earlier runs stay comparable"""
+    rng = random.Random(seed)
+    return [(rng.randrange(1, _MINHASH_PRIME), rng.randrange(_MINHASH_PRIME)) for _ in range(count)]
+
+_MINHASH_PERMUTATIONS = _minhash_permutations(MINHASH_BANDS * MINHASH_ROWS)
+
+def title_signature(title_key):
+    """MinHash signature of a normalized title"""
+    padded = f" {title_key} "
+    shingles = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big') for s in shingles]
+    return tuple(min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in _MINHASH_PERMUTATIONS)
+
+def fallback_job_id(title, company, location):
+    """ID for a card without one, so such cards don't all share an empty ID"""
+    return 'fp_' + dedup_keys({'title': title, 'company': company, 'location': location})[0]
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of title signatures, blocked by company and location.
+
+    Two titles become candidates when any band of their signatures is
+    identical, and match when the signatures agree on at least `threshold`
+    of their values (an estimate of the shingles' Jaccard similarity).
+    Lookups only compare against jobs sharing a band, so indexing a run
+    stays close to linear in the number of jobs.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self._buckets = {}
+        self._signatures = {}
+
+    @staticmethod
+    def _band_keys(block, signature):
+        for band in range(MINHASH_BANDS):
+            yield (block, band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+
+    def find(self, block, signature):
+        """Fingerprint of the most similar indexed near-duplicate, or None"""
+        best, best_agree = None, self.threshold * len(signature)
+        candidates = {}
+        for key in self._band_keys(block, signature):
+            candidates.update(dict.fromkeys(self._buckets.get(key, ())))
+        for fingerprint in candidates:
+            agree = sum(a == b for a, b in zip(signature, self._signatures[fingerprint]))
+            if agree > best_agree or (best is None and agree == best_agree):
+                best, best_agree = fingerprint, agree
+        return best
+
+    def add(self, fingerprint, block, signature):
+        """Index a signature under its fingerprint"""
+        if fingerprint in self._signatures:
+            return
+        self._signatures[fingerprint] = signature
+        for key in self._band_keys(block, signature):
+            self._buckets.setdefault(key, []).append(fingerprint)
+
+class DuplicateIndex:
+    """Merges postings of the same job found in one run into a single record.
+
+    Postings match on fingerprint, or (in fuzzy mode) on a near-identical
+    title at the same company and location. The merged record keeps the
+    first posting's fields, the best-scoring description, and a `sources`
+    list with a link to every posting.
+    """
+
+    def __init__(self, fuzzy, threshold):
+        self.records = {}
+        self.keys = {}  # fingerprint -> (block, signature)
+        self._near = NearDuplicateIndex(threshold) if fuzzy else None
+
+    def add(self, job, fingerprint, block, signature):
+        """Add a posting; return True if it started a new record"""
+        match = fingerprint if fingerprint in self.records else None
+        if match is None and self._near is not None:
+            match = self._near.find(block, signature)
+        if match is not None:
+            merge_job(self.records[match], job)
+            return False
+        
+        record = job.copy(fingerprint=fingerprint,
+                          sources=[{'source': job['source'], 'url': job['url'], 'job_id': job['job_id']}])
+        self.records[fingerprint] = record
+        self.keys[fingerprint] = (block, signature)
+        if self._near is not None:
+            self._near.add(fingerprint, block, signature)
+        return True
+
+def merge_job(record, job):
+    """Fold another posting of the same job into a merged record"""
+    if any(link['job_id'] == job['job_id'] for link in record['sources']):
+        return
+    record['sources'].append({'source': job['source'], 'url': job['url'], 'job_id': job['job_id']})
+    if job['match_score'] > record['match_score']:
+        record['match_score'] = job['match_score']
+        record['description'] = job['description']
+
+class SeenStore:
+    """Persistent record of already-reported job IDs, backed by SQLite in WAL mode.
+
+    IDs are loaded into an in-memory set for O(1) membership checks; writes
+    go straight to the database in small transactions. Entries expire
+    SEEN_JOBS_TTL_DAYS after a job was last seen in search results, instead
+    of being truncated by count. WAL plus a busy timeout lets two
+    overlapping runs share the file, and claim() makes sure only one of
+    them reports a given job.
+
+    A second table keeps the fingerprint (and, for fuzzy matching, the
+    title signature) of every reported job, so a repost under a new ID or
+    the same job on another source is recognised in later runs too.
+    """
+
+    def __init__(self, path, ttl_days, fuzzy_threshold=None):
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_id TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_jobs_last_seen ON seen_jobs (last_seen)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_fingerprints (
+                fingerprint TEXT PRIMARY KEY,
+                block TEXT NOT NULL,
+                signature TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_fingerprints_last_seen ON seen_fingerprints (last_seen)")
+        self._migrate_sent_jobs_file()
+        self.fuzzy_threshold = fuzzy_threshold
+        self._ids = None
+        self.evict_expired()
+
+    def _load(self):
+        """Build the in-memory ID set and fingerprint index from the database (caller holds the lock)"""
+        self._ids = {row[0] for row in self._conn.execute("SELECT job_id FROM seen_jobs")}
+        self._fingerprints = set()
+        self._near = NearDuplicateIndex(self.fuzzy_threshold) if self.fuzzy_threshold else None
+        for fingerprint, block, signature in self._conn.execute(
+            "SELECT fingerprint, block, signature FROM seen_fingerprints"
+        ):
+            self._fingerprints.add(fingerprint)
+            if self._near is not None and signature:
+                self._near.add(fingerprint, block, tuple(int(v, 16) for v in signature.split()))
+
+    def _migrate_sent_jobs_file(self):
+        """Import the legacy sent_jobs.json list once, then rename it out of the way"""
+        if not os.path.exists(SENT_JOBS_FILE):
+            return
+        try:
+            job_ids = load_sent_jobs()
+            now = time.time()
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO seen_jobs (job_id, first_seen, last_seen) VALUES (?, ?, ?)",
+                    [(job_id, now, now) for job_id in job_ids if job_id],
+                )
+                self._conn.execute("COMMIT")
+            os.replace(SENT_JOBS_FILE, f"{SENT_JOBS_FILE}.migrated")
+            print(f"✅ Migrated {len(job_ids)} job IDs from {SENT_JOBS_FILE} to {SEEN_JOBS_DB}")
+        except Exception as e:
+            print(f"⚠️  Could not migrate {SENT_JOBS_FILE}: {e}")
+
+    def __contains__(self, job_id):
+        return job_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def claim(self, job_ids):
+        """Record jobs as seen; return the subset that no other run had recorded yet"""
+        now = time.time()
+        claimed = set()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for job_id in job_ids:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO seen_jobs (job_id, first_seen, last_seen) VALUES (?, ?, ?)",
+                        (job_id, now, now),
+                    )
+                    if cursor.rowcount:
+                        claimed.add(job_id)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._ids.update(job_ids)
+        return claimed
+
+    def find_duplicate(self, fingerprint, block, signature=None):
+        """Fingerprint of an already-reported job matching this one, or None"""
+        if fingerprint in self._fingerprints:
+            return fingerprint
+        if self._near is not None and signature is not None:
+            return self._near.find(block, signature)
+        return None
+
+    def remember(self, keys):
+        """Record fingerprints of reported jobs; keys maps fingerprint -> (block, signature)"""
+        now = time.time()
+        rows = [
+            (fingerprint, block, ' '.join(f"{v:x}" for v in signature) if signature else None, now, now)
+            for fingerprint, (block, signature) in keys.items()
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_fingerprints (fingerprint, block, signature, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+            for fingerprint, (block, signature) in keys.items():
+                self._fingerprints.add(fingerprint)
+                if self._near is not None and signature:
+                    self._near.add(fingerprint, block, signature)
+
+    def touch(self, job_ids, fingerprints=()):
+        """Refresh last_seen for jobs that showed up again, postponing their expiry"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "UPDATE seen_jobs SET last_seen = ? WHERE job_id = ?",
+                [(now, job_id) for job_id in job_ids],
+            )
+            self._conn.executemany(
+                "UPDATE seen_fingerprints SET last_seen = ? WHERE fingerprint = ?",
+                [(now, fingerprint) for fingerprint in fingerprints],
+            )
+            self._conn.execute("COMMIT")
+
+    def evict_expired(self):
+        """Delete jobs not seen within the TTL, in the database and in memory"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            evicted = self._conn.execute("DELETE FROM seen_jobs WHERE last_seen < ?", (cutoff,)).rowcount
+            evicted_fingerprints = self._conn.execute(
+                "DELETE FROM seen_fingerprints WHERE last_seen < ?", (cutoff,)
+            ).rowcount
+            if evicted or evicted_fingerprints or self._ids is None:
+                self._load()
+        return evicted
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+class HostRateLimiter:
+    """Token bucket per host (thread-safe).
+
+    Each host's bucket holds up to `burst` tokens and refills one token
+    every min_interval seconds. A request takes a token; when the bucket is
+    empty the balance goes negative, which reserves the next slots in
+    arrival order, and the caller sleeps until its slot comes up.
+    """
+
+    def __init__(self, min_interval, burst=1):
+        self.min_interval = min_interval
+        self.burst = burst
+        self._buckets = {}  # host -> [tokens, monotonic time of last refill]
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until a request to the URL's host is allowed"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, [self.burst, now])
+            if self.min_interval > 0:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) / self.min_interval)
+            else:
+                bucket[0] = self.burst
+            bucket[1] = now
+            bucket[0] -= 1
+            delay = -bucket[0] * self.min_interval if bucket[0] < 0 else 0
+        if delay > 0:
+            time.sleep(delay)
+
+# Shared by all scrapers so politeness is enforced per host, not per thread
+RATE_LIMITER = HostRateLimiter(HOST_MIN_INTERVAL, HOST_BURST)
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+    def __init__(self, host, reason):
+        super().__init__(f"circuit open for {host} ({reason})")
+        self.host = host
+
+def retry_after_seconds(response):
+    """Retry-After header as seconds (delta or HTTP date), or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def is_challenge_page(content):
+    """Whether a 200 response is really a bot check"""
+    return any(marker in content for marker in CHALLENGE_MARKERS)
+
+class CircuitBreaker:
+    """Per-host circuit breaker, persisted to a JSON file.
+
+    A 429/403, a bot-challenge page or BREAKER_TIMEOUT_STREAK timeouts in a
+    row open the circuit: requests to that host fail fast with
+    CircuitOpenError for the cooldown (Retry-After if the host sent one,
+    else BREAKER_COOLDOWN_MINUTES doubled per consecutive trip). After the
+    cooldown one probe request is let through (half-open); other requests
+    wait for it, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._hosts = None
+        self._timeouts = {}
+        self._probing = set()
+        self._announced = set()
+        self._changed = threading.Condition()
+
+    def _load(self):
+        """Load saved state on first use (caller holds the lock)"""
+        if self._hosts is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._hosts = json.load(f)
+            except (OSError, ValueError):
+                self._hosts = {}
+        return self._hosts
+
+    def _save(self, host):
+        """Write host's state into the file, keeping other processes' hosts (caller holds the lock)"""
+        try:
+            with file_lock(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        hosts = json.load(f)
+                except (OSError, ValueError):
+                    hosts = {}
+                if host in self._hosts:
+                    hosts[host] = self._hosts[host]
+                else:
+                    hosts.pop(host, None)
+                with atomic_write(self.path) as f:
+                    json.dump(hosts, f, indent=2)
+            self._hosts = hosts
+        except OSError as e:
+            print(f"⚠️  Could not save circuit breaker state: {e}")
+
+    def before_request(self, host):
+        """Return if a request to host may go out now; raise CircuitOpenError if not"""
+        with self._changed:
+            while True:
+                state = self._load().get(host)
+                if state is None or state.get('open_until') is None:
+                    return
+                if time.time() < state['open_until']:
+                    if host not in self._announced:
+                        self._announced.add(host)
+                        until = datetime.fromtimestamp(state['open_until']).strftime('%Y-%m-%d %H:%M')
+                        print(f"⏸️  Skipping {host} until {until}: circuit open ({state['reason']})")
+                    raise CircuitOpenError(host, state['reason'])
+                if host not in self._probing:
+                    self._probing.add(host)  # Half-open: this request is the probe
+                    return
+                if not self._changed.wait(CONNECT_TIMEOUT + READ_TIMEOUT):
+                    return  # The probe never reported back; go ahead anyway
+
+    def record_response(self, host, response):
+        """Judge a response; returns the reason if it opened the circuit, else None"""
+        reason, retry_after = None, None
+        if response.status_code in BREAKER_STATUSES:
+            reason = f"HTTP {response.status_code}"
+            retry_after = retry_after_seconds(response)
+        elif response.status_code == 200 and is_challenge_page(response.content):
+            reason = "challenge page"
+        with self._changed:
+            self._timeouts[host] = 0
+            if reason:
+                self._trip(host, reason, retry_after)
+            else:
+                self._close(host)
+        return reason
+
+    def record_error(self, host, error):
+        """Count a timeout or connection error; a streak of them opens the circuit"""
+        with self._changed:
+            self._timeouts[host] = self._timeouts.get(host, 0) + 1
+            if self._timeouts[host] >= BREAKER_TIMEOUT_STREAK or host in self._probing:
+                self._timeouts[host] = 0
+                self._trip(host, f"{type(error).__name__} streak", None)
+
+    def _trip(self, host, reason, retry_after):
+        """Open the circuit for host (caller holds the lock)"""
+        state = self._load().setdefault(host, {'trips': 0})
+        if state.get('open_until') and time.time() < state['open_until']:
+            return  # Already open, e.g. a concurrent request got the same 429
+        state['trips'] += 1
+        if retry_after is not None:
+            cooldown = min(retry_after, BREAKER_MAX_COOLDOWN_MINUTES * 60)
+        else:
+            cooldown = min(BREAKER_COOLDOWN_MINUTES * 60 * 2 ** (state['trips'] - 1), BREAKER_MAX_COOLDOWN_MINUTES * 60)
+        state.update({'open_until': time.time() + cooldown, 'reason': reason})
+        self._probing.discard(host)
+        self._announced.add(host)
+        METRICS.add('circuit_trips')
+        print(f"🛑 {host} is blocking us ({reason}): pausing it for {cooldown / 60:.0f} min")
+        self._save(host)
+        self._changed.notify_all()
+
+    def _close(self, host):
+        """Close the circuit after a good response (caller holds the lock)"""
+        state = self._load().get(host)
+        if host in self._probing or (state and state.get('open_until') is not None):
+            self._probing.discard(host)
+            self._announced.discard(host)
+            if self._load().pop(host, None) is not None:
+                print(f"✅ {host} is answering again, circuit closed")
+                self._save(host)
+            self._changed.notify_all()
+
+    def open_hosts(self):
+        """{host: reason} for circuits open right now"""
+        with self._changed:
+            now = time.time()
+            return {host: state['reason'] for host, state in self._load().items()
+                    if state.get('open_until') and now < state['open_until']}
+
+# Shared so every thread sees a host trip at once
+CIRCUIT_BREAKER = CircuitBreaker(BREAKER_STATE_FILE)
+
+class HttpClient:
+    """Pooled keep-alive sessions (one per host) with retry and backoff.
+
+    Every request goes through the shared rate limiter and circuit breaker,
+    and is retried on connection errors, timeouts and RETRY_STATUSES with
+    exponential backoff plus full jitter. Responses showing the host is
+    blocking us open its circuit instead of being retried. Per-host latency,
+    retry and connection reuse counts are collected for the end-of-run report.
+    """
+
+    def __init__(self, rate_limiter, breaker=None):
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        self._sessions = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _session(self, url):
+        """Get (or create) the persistent session for a URL's host"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}/"
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                session.headers.update({'User-Agent': USER_AGENT})
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[origin] = session
+                self._stats[parsed.netloc] = {'requests': 0, 'retries': 0, 'errors': 0, 'latencies': []}
+            return session
+
+    def _record(self, host, key, latency=None):
+        """Update a per-host counter (and latency sample)"""
+        with self._lock:
+            stats = self._stats[host]
+            stats[key] += 1
+            if latency is not None:
+                stats['latencies'].append(latency)
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter for the given retry"""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def get(self, url, headers=None):
+        """GET a URL, retrying transient failures.
+
+        Raises the last error if all attempts fail, or CircuitOpenError if
+        the host is (or just turned out to be) blocking us.
+        """
+        session = self._session(url)
+        host = urlparse(url).netloc
+        response, error = None, None
+        
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                self._record(host, 'retries')
+                time.sleep(self._backoff(attempt - 1))
+            
+            if self.breaker:
+                self.breaker.before_request(host)
+            self.rate_limiter.wait(url)
+            start = time.perf_counter()
+            try:
+                response = session.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            
+            if error is not None:
+                self._record(host, 'errors')
+                if self.breaker:
+                    self.breaker.record_error(host, error)
+                continue
+            self._record(host, 'requests', time.perf_counter() - start)
+            if self.breaker:
+                reason = self.breaker.record_response(host, response)
+                if reason:
+                    raise CircuitOpenError(host, reason)
+            if response.status_code not in RETRY_STATUSES:
+                break
+        
+        if error is not None:
+            raise error
+        if RECORD_DIR:
+            record_response(url, response)
+        return response
+
+    def stats(self):
+        """Per-host request statistics, including reused keep-alive connections"""
+        report = {}
+        with self._lock:
+            for origin, session in self._sessions.items():
+                host = urlparse(origin).netloc
+                stats = self._stats[host]
+                latencies = sorted(stats['latencies'])
+                pools = session.get_adapter(origin).poolmanager.pools
+                opened = sum(pools[key].num_connections for key in pools.keys())
+                sent = sum(pools[key].num_requests for key in pools.keys())
+                report[host] = {
+                    'requests': stats['requests'],
+                    'retries': stats['retries'],
+                    'errors': stats['errors'],
+                    'connections_opened': opened,
+                    'connections_reused': max(sent - opened, 0),
+                    'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'latency_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+                    'latency_max': latencies[-1] if latencies else 0.0,
+                }
+        return report
+
+    def print_stats(self):
+        """Print a one-line summary per host"""
+        for host, stats in self.stats().items():
+            print(f"  - {host}: {stats['requests']} requests, {stats['retries']} retries, "
+                  f"{stats['errors']} errors, {stats['connections_reused']} reused connections, "
+                  f"latency avg {stats['latency_avg']:.2f}s / p95 {stats['latency_p95']:.2f}s / "
+                  f"max {stats['latency_max']:.2f}s")
+
+# Shared client used by every scraper
+HTTP_CLIENT = HttpClient(RATE_LIMITER, CIRCUIT_BREAKER)
+
+RECORD_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+_record_lock = threading.Lock()
+
+def record_response(url, response):
+    """Save a fetched page and its metadata to RECORD_DIR as a replay fixture"""
+    try:
+        with _record_lock:
+            os.makedirs(RECORD_DIR, exist_ok=True)
+            prefix = next((source.lower() for source in CARD_SELECTORS if source.lower() in url.lower()), "page")
+            name = f"{prefix}_{hashlib.sha1(url.encode()).hexdigest()[:12]}.html"
+            with atomic_write(os.path.join(RECORD_DIR, name), 'wb') as f:
+                f.write(response.content)
+            
+            manifest_path = os.path.join(RECORD_DIR, "manifest.json")
+            manifest = {}
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+            manifest[url] = {
+                'file': name,
+                'status': response.status_code,
+                'headers': {key: response.headers[key] for key in RECORD_HEADERS if key in response.headers},
+            }
+            with atomic_write(manifest_path) as f:
+                json.dump(manifest, f, indent=2)
+    except Exception as e:
+        print(f"⚠️  Could not record {url}: {e}")
+
+def _prom_labels(**labels):
+    """Render Prometheus labels, escaping values"""
+    def esc(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{esc(value)}"' for key, value in labels.items()) + "}"
+
+class RunMetrics:
+    """Wall/CPU timings per stage and per (title, source) query for one run.
+
+    Stages are timed with the process clock (all threads); queries with
+    the thread clock of the worker that ran them. Page-level counters
+    (HTTP status, bytes, cards parsed/dropped) are attributed to the query
+    running on the current thread.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start a fresh run"""
+        self.started = time.time()
+        self.stages = {}
+        self.queries = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage (repeated stages, e.g. one per profile, add up)"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                totals = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+                totals['wall_seconds'] += time.perf_counter() - wall
+                totals['cpu_seconds'] += time.process_time() - cpu
+
+    @staticmethod
+    def _query_record(job_title, source):
+        return {
+            'title': job_title, 'source': source, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+            'pages': 0, 'bytes': 0, 'statuses': {}, 'cards_parsed': 0, 'cards_dropped': 0,
+            'jobs': 0, 'errors': 0, 'complete': False,
+        }
+
+    @contextmanager
+    def query(self, job_title, source):
+        """Time one (title, source) query and collect its page counters"""
+        record = self._query_record(job_title, source)
+        self._local.query = record
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.thread_time() - cpu
+            self._local.query = None
+            with self._lock:
+                self.queries[(job_title, source)] = record
+
+    def remote_query(self, job_title, source, **values):
+        """Record a query whose pages were fetched by work-queue workers"""
+        record = self._query_record(job_title, source)
+        record.update(values)
+        with self._lock:
+            self.queries[(job_title, source)] = record
+        return record
+
+    def _current(self):
+        return getattr(self._local, 'query', None)
+
+    def page(self, status, size):
+        """Count a fetched results page for the current query"""
+        record = self._current()
+        if record is not None:
+            record['pages'] += 1
+            record['bytes'] += size
+            record['statuses'][str(status)] = record['statuses'].get(str(status), 0) + 1
+
+    def cards(self, parsed, dropped):
+        """Count cards found on a page and cards dropped because they failed to parse"""
+        record = self._current()
+        if record is not None:
+            record['cards_parsed'] += parsed
+            record['cards_dropped'] += dropped
+
+    def error(self):
+        """Count a failed query"""
+        record = self._current()
+        if record is not None:
+            record['errors'] += 1
+
+    def count(self, name, value):
+        """Set a run-level counter"""
+        with self._lock:
+            self.counters[name] = value
+
+    def add(self, name, value=1):
+        """Add to a run-level counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def print_summary(self):
+        """Print stage timings to the log"""
+        print("Stage timings:")
+        for name, stage in self.stages.items():
+            print(f"  - {name}: {stage['wall_seconds']:.2f}s wall, {stage['cpu_seconds']:.2f}s CPU")
+
+    def to_dict(self, http_stats, cache_stats):
+        """Everything recorded for this run, as JSON-ready data"""
+        return {
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'duration_seconds': time.time() - self.started,
+            'stages': self.stages,
+            'queries': list(self.queries.values()),
+            'http': http_stats,
+            'cache': cache_stats,
+            'counters': self.counters,
+        }
+
+    def to_prometheus(self, data):
+        """Render run data in the Prometheus text exposition format"""
+        lines = []
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP jobs_{name} {help_text}")
+            lines.append(f"# TYPE jobs_{name} gauge")
+            lines.extend(f"jobs_{name}{_prom_labels(**labels)} {value}" for labels, value in samples)
+        
+        metric("run_timestamp_seconds", "Start time of the last run.", [({}, self.started)])
+        metric("run_duration_seconds", "Wall time of the last run.", [({}, data['duration_seconds'])])
+        for key in ('wall_seconds', 'cpu_seconds'):
+            metric(f"stage_{key}", f"Stage {key.replace('_', ' ')}.",
+                   [({'stage': name}, stage[key]) for name, stage in self.stages.items()])
+        for key in ('wall_seconds', 'cpu_seconds', 'pages', 'bytes', 'cards_parsed', 'cards_dropped', 'jobs', 'errors'):
+            metric(f"query_{key}", f"Per-query {key.replace('_', ' ')}.",
+                   [({'title': q['title'], 'source': q['source']}, q[key]) for q in data['queries']])
+        metric("query_http_responses", "Results pages by HTTP status.",
+               [({'title': q['title'], 'source': q['source'], 'status': status}, count)
+                for q in data['queries'] for status, count in q['statuses'].items()])
+        for key in ('requests', 'retries', 'errors', 'connections_reused', 'latency_avg', 'latency_max'):
+            metric(f"http_{key}", f"Per-host HTTP {key.replace('_', ' ')}.",
+                   [({'host': host}, stats[key]) for host, stats in data['http'].items()])
+        metric("cache_events", "Response cache outcomes.",
+               [({'outcome': outcome}, count) for outcome, count in data['cache'].items()])
+        metric("run_counter", "Run-level counters.",
+               [({'name': name}, value) for name, value in self.counters.items()])
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory, http_stats, cache_stats):
+        """Write metrics/run_<timestamp>.json and the Prometheus textfile"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            data = self.to_dict(http_stats, cache_stats)
+            stamp = datetime.fromtimestamp(self.started).strftime('%Y%m%d_%H%M%S')
+            json_path = os.path.join(directory, f"run_{stamp}.json")
+            with atomic_write(json_path) as f:
+                json.dump(data, f, indent=2)
+            # The node exporter never sees a partial file
+            with atomic_write(os.path.join(directory, METRICS_PROM_FILE)) as f:
+                f.write(self.to_prometheus(data))
+            print(f"📊 Metrics written to {json_path}")
+        except Exception as e:
+            print(f"⚠️  Could not write metrics: {e}")
+
+METRICS = RunMetrics()
+
+class ResponseCache:
+    """URL-keyed on-disk cache of results pages, with conditional revalidation.
+
+    Pages younger than the TTL are served from disk without touching the
+    network. Older pages are revalidated with If-None-Match/If-Modified-Since.
+    Every page carries a content hash, and the jobs parsed from it are kept
+    next to it, so a page that hasn't changed is never parsed twice. Its
+    jobs are still scored on every run.
+    Total size on disk is bounded with least-recently-used eviction, and
+    page files no index entry points to are swept.
+    """
+
+    INDEX_FILE = "index.json"
+    ORPHAN_GRACE_SECONDS = 3600  # An unindexed body this new may be another process's, not saved yet
+
+    def __init__(self, client, directory, ttl_minutes, max_mb):
+        self.client = client
+        self.directory = directory
+        self.ttl_seconds = ttl_minutes * 60
+        self.max_bytes = max_mb * 1024 * 1024
+        self.stats = {'hits': 0, 'revalidated': 0, 'unchanged': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load(self):
+        """Load the index on first use (caller holds the lock)"""
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            try:
+                with open(os.path.join(self.directory, self.INDEX_FILE), 'r') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _body_path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest() + ".html")
+
+    def _read_body(self, url):
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def fetch(self, url):
+        """Return (content, content_hash, status_code) for a URL, using the cache when possible"""
+        with self._lock:
+            entry = dict(self._load().get(url) or {})
+        body = self._read_body(url) if entry else None
+        
+        if body is not None and time.time() - entry['fetched_at'] < self.ttl_seconds:
+            self._touch(url, entry)
+            self._count('hits')
+            return body, entry['content_hash'], 200
+        
+        headers = {}
+        if body is not None and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if body is not None and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        
+        response = self.client.get(url, headers=headers or None)
+        if response.status_code == 304 and body is not None:
+            self._count('revalidated')
+            self._touch(url, entry, fetched=True)
+            return body, entry['content_hash'], 200
+        if response.status_code != 200:
+            return response.content, None, response.status_code
+        
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        self._count('unchanged' if content_hash == entry.get('content_hash') else 'misses')
+        self._store(url, response, content_hash)
+        return response.content, content_hash, 200
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _touch(self, url, entry, fetched=False):
+        """Mark an entry as recently used (and freshly validated)"""
+        with self._lock:
+            current = self._load().get(url)
+            if current is not None:
+                current['last_used'] = time.time()
+                if fetched:
+                    current['fetched_at'] = current['last_used']
+
+    def _store(self, url, response, content_hash):
+        """Write a fresh page to disk and index it"""
+        with atomic_write(self._body_path(url), 'wb') as f:
+            f.write(response.content)
+        now = time.time()
+        with self._lock:
+            index = self._load()
+            previous = index.get(url) or {}
+            index[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash,
+                'size': len(response.content),
+                'fetched_at': now,
+                'last_used': now,
+                # Parsed jobs stay valid as long as the content is identical
+                'parsed_key': previous.get('parsed_key') if previous.get('content_hash') == content_hash else None,
+                'jobs': previous.get('jobs') if previous.get('content_hash') == content_hash else None,
+            }
+
+    def parsed_jobs(self, url, parsed_key):
+        """Jobs previously parsed from this exact page content, or None"""
+        with self._lock:
+            entry = self._load().get(url)
+            if entry and parsed_key and entry.get('parsed_key') == parsed_key:
+                return [Job.from_dict(job) for job in entry['jobs']]
+        return None
+
+    def store_parsed(self, url, parsed_key, jobs):
+        """Remember the jobs parsed from a page"""
+        with self._lock:
+            entry = self._load().get(url)
+            if entry and parsed_key:
+                entry['parsed_key'] = parsed_key
+                entry['jobs'] = [job.to_dict() for job in jobs]  # Copies: jobs are enriched and merged later
+
+    def save(self):
+        """Merge in the index on disk, evict least recently used pages beyond the size limit and write the index"""
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        with self._lock, file_lock(index_path):
+            index = self._load()
+            # Other processes sharing the directory (local workers) may have saved since we loaded
+            try:
+                with open(index_path, 'r') as f:
+                    on_disk = json.load(f)
+            except (OSError, ValueError):
+                on_disk = {}
+            for url, theirs in on_disk.items():
+                ours = index.get(url)
+                if ours is None or theirs['fetched_at'] > ours['fetched_at']:
+                    # The newest fetch wrote the body file, so its entry describes it
+                    index[url] = dict(theirs, last_used=max(theirs['last_used'], ours['last_used'] if ours else 0))
+                else:
+                    ours['last_used'] = max(ours['last_used'], theirs['last_used'])
+            # The size budget counts what is on disk, including bodies a killed run never indexed
+            sizes, orphans = {}, []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".html"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                sizes[path] = stat.st_size
+                if time.time() - stat.st_mtime > self.ORPHAN_GRACE_SECONDS:
+                    orphans.append(path)  # If nothing indexes it
+            for url in [url for url in index if self._body_path(url) not in sizes]:
+                del index[url]  # Body gone
+            indexed = {self._body_path(url) for url in index}
+            for path in orphans:
+                if path not in indexed:
+                    del sizes[path]
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            total = sum(sizes.values())
+            for url in sorted(index, key=lambda u: index[u]['last_used']):
+                if total <= self.max_bytes:
+                    break
+                del index[url]
+                path = self._body_path(url)
+                total -= sizes[path]
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with atomic_write(index_path) as f:
+                json.dump(index, f)
+
+    def print_stats(self):
+        """Print this run's cache counters"""
+        stats = self.stats
+        print(f"  - cache: {stats['hits']} hits, {stats['revalidated']} revalidated (304), "
+              f"{stats['unchanged']} unchanged (same content hash), {stats['misses']} misses")
+
+HTTP_CACHE = ResponseCache(HTTP_CLIENT, HTTP_CACHE_DIR, HTTP_CACHE_TTL_MINUTES, HTTP_CACHE_MAX_MB)
+
+class SkillMatcher:
+    """Word-boundary keyword matcher, compiled once from the config.
+
+    Each keyword gets a precompiled pattern anchored on its literal text, so
+    "AI" no longer matches "maintain" and "ML" no longer matches "HTML".
+    A plain substring check runs first and the boundary pattern is only
+    evaluated for keywords that can possibly match, which keeps the cost of
+    a job close to the old substring scan.
+    """
+
+    def __init__(self, required, nice_to_have, leadership):
+        # (keyword, points, is_stem) for every configured keyword
+        self.terms = (
+            [(kw, REQUIRED_SKILL_POINTS, False) for kw in required]
+            + [(kw, NICE_TO_HAVE_POINTS, False) for kw in nice_to_have]
+            + [(kw, LEADERSHIP_POINTS, True) for kw in leadership]
+        )
+        self._needles = [kw.lower() for kw, _, _ in self.terms]
+        # Literal first (fast prefix search), then check the word boundaries
+        self._patterns = [
+            re.compile(rf'{re.escape(needle)}(?<!\w{re.escape(needle)})' + (r'' if stem else r'(?!\w)'))
+            for needle, (_, _, stem) in zip(self._needles, self.terms)
+        ]
+
+    def match_indexes(self, text):
+        """Indexes (into self.terms) of every keyword found in text"""
+        text = text.lower()
+        return [
+            i for i, needle in enumerate(self._needles)
+            if needle in text and self._patterns[i].search(text)
+        ]
+
+    def matches(self, job_title, job_description):
+        """Keywords found in a job's title and description"""
+        return {self.terms[i][0] for i in self.match_indexes(f"{job_title} {job_description}")}
+
+    def score(self, job_title, job_description):
+        """Match score (0-100) for a single job"""
+        found = self.match_indexes(f"{job_title} {job_description}")
+        return min(sum(self.terms[i][1] for i in found), 100)  # Cap at 100
+
+    def score_many(self, jobs):
+        """Match scores for a batch of job dicts (uses 'title' and 'description')"""
+        return [self.score(job['title'], job.get('description', '')) for job in jobs]
+
+# Punctuation that separates words ("." "+" "#" are kept so "node.js", "c++" and "c#" stay whole)
+_TOKEN_SEPARATORS = str.maketrans({
+    c: ' ' for c in [chr(i) for i in range(128) if not (chr(i).isalnum() or chr(i) in '.+#')] + list('\u00a0\u2013\u2014\u2018\u2019\u201c\u201d\u2022\u2026')
+})
+
+def tokenize(text):
+    """Lowercase word tokens; str methods only, since this runs over every job in a batch"""
+    return text.lower().translate(_TOKEN_SEPARATORS).replace('. ', ' ').rstrip('.').split()
+
+RESUME_STOPWORDS = {
+    'and', 'the', 'for', 'with', 'from', 'that', 'this', 'was', 'were', 'are', 'have', 'has', 'our',
+    'your', 'you', 'into', 'over', 'per', 'all', 'using', 'used', 'team', 'work', 'years', 'year',
+}
+
+def load_resume_text(path):
+    """Resume text for the scoring profile ('' if none is configured or readable)"""
+    if not path:
+        return ""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        print(f"⚠️  Could not read resume {path}: {e}")
+        return ""
+
+def profile_weights(required, nice_to_have, leadership, resume_text=""):
+    """({term tuple: points}, stem words) for a skills profile"""
+    weights = {}
+    stems = set()
+    for keywords, points in ((required, REQUIRED_SKILL_POINTS), (nice_to_have, NICE_TO_HAVE_POINTS),
+                             (leadership, LEADERSHIP_POINTS)):
+        for keyword in keywords:
+            term = tuple(tokenize(keyword))
+            weights[term] = weights.get(term, 0) + points
+            if keywords is leadership:
+                stems.add(term[0])
+    resume_tokens = {
+        token for token in tokenize(resume_text)
+        if len(token) > 2 and not token.isdigit() and token not in RESUME_STOPWORDS
+    }
+    for token in resume_tokens:
+        weights[(token,)] = weights.get((token,), 0) + RESUME_TERM_POINTS
+    return weights, stems
+
+class RelevanceScorer:
+    """Batch BM25 scoring of jobs against a weighted skills profile.
+
+    Each job becomes a sparse row of term frequencies over the profile's
+    terms (single words, phrases such as "react native", and leadership
+    stems). Frequencies are saturated and length-normalized BM25-style,
+    weighted by each term's rarity and its profile points, and summed per
+    job in one vectorized pass (NumPy if installed, else the same
+    arithmetic in Python). Rarity and average length come from
+    TERM_STATS_FILE, the postings scored by earlier runs, and stay fixed
+    until save_stats(): a job scores the same whichever batch or chunk it
+    is in. Raw points map to 0-100 through
+    100 * (1 - exp(-raw / RELEVANCE_SCALE)), so scores stay comparable
+    between runs instead of piling up at a hard cap.
+    """
+
+    # Statistics are smoothed with this many pseudo-documents, each term appearing
+    # in 10% of them and PRIOR_LENGTH long, so the first runs don't swing the weights
+    PRIOR_DOCS = 100
+    PRIOR_RATE = 0.1
+    PRIOR_LENGTH = 200.0
+
+    def __init__(self, required, nice_to_have, leadership, resume_text=""):
+        weights, stems = profile_weights(required, nice_to_have, leadership, resume_text)
+        self._build_vocabulary(list(weights), stems)
+        self.weights = [weights[term] for term in self.terms]
+
+    def _build_vocabulary(self, terms, stems):
+        self.terms = terms
+        self._term_ids = {term: i for i, term in enumerate(self.terms)}
+        self._stems = [(term[0], self._term_ids[term]) for term in self.terms if len(term) == 1 and term[0] in stems]
+        self._phrases = [(f" {' '.join(term)} ", i) for i, term in enumerate(self.terms) if len(term) > 1]
+        # Every token seen so far, and those that count towards profile terms (exact word or stem)
+        self._seen_tokens = set()
+        self._token_ids = {}
+        self.backend = 'numpy' if np is not None else 'python'
+        self.load_stats()
+
+    def load_stats(self):
+        """Read the term statistics from TERM_STATS_FILE and fix rarity and average length from them"""
+        try:
+            with open(TERM_STATS_FILE, 'r') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        docs = stats.get('docs', 0)
+        doc_freq = [stats.get('doc_freq', {}).get(' '.join(term), 0) for term in self.terms]
+        self._idf_values = self._idf(np.asarray(doc_freq, dtype=float) if np is not None else doc_freq, docs)
+        self._avg_length = ((stats.get('length', 0.0) + self.PRIOR_DOCS * self.PRIOR_LENGTH)
+                            / (docs + self.PRIOR_DOCS))
+        self._learned = {'docs': 0, 'length': 0.0, 'doc_freq': {}}
+
+    def save_stats(self):
+        """Add the postings scored with learn=True to TERM_STATS_FILE and reload it (call once per run)"""
+        learned = self._learned
+        if learned['docs']:
+            with file_lock(TERM_STATS_FILE):
+                try:
+                    with open(TERM_STATS_FILE, 'r') as f:
+                        stats = json.load(f)
+                except (OSError, ValueError):
+                    stats = {}
+                stats['docs'] = stats.get('docs', 0) + learned['docs']
+                stats['length'] = stats.get('length', 0.0) + learned['length']
+                doc_freq = stats.setdefault('doc_freq', {})
+                for term, count in learned['doc_freq'].items():
+                    doc_freq[term] = doc_freq.get(term, 0) + count
+                with atomic_write(TERM_STATS_FILE) as f:
+                    json.dump(stats, f)
+        self.load_stats()
+
+    def _learn_tokens(self, tokens):
+        """Work out which profile terms newly seen tokens count towards"""
+        for token in tokens:
+            exact = self._term_ids.get((token,))
+            ids = {i for stem, i in self._stems if token.startswith(stem)}
+            if exact is not None:
+                ids.add(exact)
+            if ids:
+                self._token_ids[token] = tuple(ids)
+        self._seen_tokens |= tokens
+
+    def _term_counts(self, job):
+        """({term id: weighted frequency}, weighted length) for one job"""
+        counts = {}
+        length = 0.0
+        for text, weight in ((job['title'], TITLE_TERM_WEIGHT), (job.get('description', ''), 1.0)):
+            tokens = tokenize(text)
+            length += weight * len(tokens)
+            distinct = set(tokens)
+            new_tokens = distinct - self._seen_tokens
+            if new_tokens:
+                self._learn_tokens(new_tokens)
+            # Set operations and count() run in C; only matching tokens reach Python
+            for token in distinct & self._token_ids.keys():
+                found = tokens.count(token)
+                for i in self._token_ids[token]:
+                    counts[i] = counts.get(i, 0.0) + weight * found
+            if self._phrases:
+                joined = f" {' '.join(tokens)} "
+                for phrase, i in self._phrases:
+                    found = joined.count(phrase)
+                    if found:
+                        counts[i] = counts.get(i, 0.0) + weight * found
+        return counts, length
+
+    def _idf(self, doc_freq, docs):
+        """Smoothed BM25 rarity, relative to a term found in PRIOR_RATE of documents"""
+        total = docs + self.PRIOR_DOCS
+        prior = self.PRIOR_DOCS * self.PRIOR_RATE
+        reference = math.log1p((total * (1 - self.PRIOR_RATE) + 0.5) / (total * self.PRIOR_RATE + 0.5))
+        if np is not None:
+            df = doc_freq + prior
+            return np.log1p((total - df + 0.5) / (df + 0.5)) / reference
+        return [math.log1p((total - f - prior + 0.5) / (f + prior + 0.5)) / reference for f in doc_freq]
+
+    def term_matrix(self, jobs, learn=False):
+        """Sparse jobs x terms matrix as (rows, cols, values), values being BM25 weight times rarity.
+
+        NumPy arrays when NumPy is installed, else lists. learn=True also
+        counts the jobs towards the statistics save_stats() writes.
+        """
+        rows, cols, freqs, lengths = [], [], [], []
+        for row, job in enumerate(jobs):
+            counts, length = self._term_counts(job)
+            rows.extend([row] * len(counts))
+            cols.extend(counts)
+            freqs.extend(counts.values())
+            lengths.append(length)
+        if learn:
+            learned = self._learned
+            learned['docs'] += len(jobs)
+            learned['length'] += sum(lengths)
+            for col in cols:
+                term = ' '.join(self.terms[col])
+                learned['doc_freq'][term] = learned['doc_freq'].get(term, 0) + 1
+        idf, avg_length = self._idf_values, self._avg_length
+        
+        if np is not None:
+            rows, cols = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+            freqs, lengths = np.asarray(freqs, dtype=float), np.asarray(lengths, dtype=float)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+            return rows, cols, freqs * (BM25_K1 + 1) / (freqs + norm[rows]) * idf[cols]
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in lengths]
+        values = [freq * (BM25_K1 + 1) / (freq + norms[row]) * idf[col] for row, col, freq in zip(rows, cols, freqs)]
+        return rows, cols, values
+
+    @staticmethod
+    def _row_sums(docs, rows, cols, values, weights):
+        """Raw points per job: the matrix times a profile weight vector"""
+        if np is not None:
+            return np.bincount(rows, weights=values * np.asarray(weights, dtype=float)[cols], minlength=docs)
+        raw = [0.0] * docs
+        for row, col, value in zip(rows, cols, values):
+            raw[row] += value * weights[col]
+        return raw
+
+    @staticmethod
+    def _calibrate(raw):
+        """Map raw points onto 0-100"""
+        if np is not None:
+            return np.rint(100 * (1 - np.exp(-np.asarray(raw) / RELEVANCE_SCALE))).astype(int).tolist()
+        return [int(round(100 * (1 - math.exp(-points / RELEVANCE_SCALE)))) for points in raw]
+
+    def score_many(self, jobs, learn=False):
+        """Calibrated 0-100 scores for a batch of jobs (uses 'title' and 'description'; learn: see term_matrix)"""
+        if not jobs:
+            return []
+        rows, cols, values = self.term_matrix(jobs, learn)
+        return self._calibrate(self._row_sums(len(jobs), rows, cols, values, self.weights))
+
+# Built once at import so every job is scored with the same compiled matcher
+SKILL_MATCHER = SkillMatcher(REQUIRED_SKILLS, NICE_TO_HAVE, LEADERSHIP_KEYWORDS)
+RELEVANCE_SCORER = RelevanceScorer(REQUIRED_SKILLS, NICE_TO_HAVE, LEADERSHIP_KEYWORDS, load_resume_text(RESUME_FILE))
+
+def score_jobs(jobs):
+    """Set match_score on a batch of jobs with the configured SCORING_ENGINE"""
+    if SCORING_ENGINE == 'relevance':
+        scores = RELEVANCE_SCORER.score_many(jobs, learn=True)
+    else:
+        scores = SKILL_MATCHER.score_many(jobs)
+    for job, score in zip(jobs, scores):
+        job['match_score'] = score
 
 def calculate_match_score(job_title, job_description):
     """Calculate how well a job matches the resume (0-100)"""
-    score = 0
-    text = f"{job_title} {job_description}".lower()
-    
-    # Required skills (10 points each)
-    for skill in REQUIRED_SKILLS:
-        if skill.lower() in text:
-            score += 10
+    if SCORING_ENGINE == 'relevance':
+        return RELEVANCE_SCORER.score_many([{'title': job_title, 'description': job_description}])[0]
+    return SKILL_MATCHER.score(job_title, job_description)
+
+# ============================================
+# HTML PARSING
+# ============================================
+
+# Where each field lives inside a job card, declared once per source.
+# 'card' selects the card itself; every other entry is searched within a card.
+CARD_SELECTORS = {
+    'Indeed': {
+        'card': ('div', {'class': 'job_seen_beacon'}),
+        'title': ('h2', {'class': 'jobTitle'}),
+        'company': ('span', {'data-testid': 'company-name'}),
+        'location': ('div', {'data-testid': 'text-location'}),
+        'description': ('div', {'class': 'job-snippet'}),
+    },
+    'LinkedIn': {
+        'card': ('div', {'class': 'base-card'}),
+        'title': ('h3', {'class': 'base-search-card__title'}),
+        'company': ('h4', {'class': 'base-search-card__subtitle'}),
+        'location': ('span', {'class': 'job-search-card__location'}),
+        'link': ('a', {'class': 'base-card__full-link'}),
+    },
+}
+
+def _class_matcher(css_class):
+    """Match a class attribute whether it is still a raw string (while parsing) or a list"""
+    def match(value):
+        if not value:
+            return False
+        values = value.split() if isinstance(value, str) else value
+        return css_class in values
+    return match
+
+def _compile_selector(tag, attrs):
+    """Turn a (tag, attrs) selector into a reusable SoupStrainer"""
+    attrs = {
+        key: _class_matcher(value) if key == 'class' else value
+        for key, value in attrs.items()
+    }
+    return SoupStrainer(tag, attrs=attrs)
+
+def _resolve_html_parser(name):
+    """Fall back to the built-in parser if lxml is selected but not installed"""
+    if name == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            print("⚠️  lxml is not installed, falling back to html.parser")
+            return 'html.parser'
+    return name
+
+COMPILED_SELECTORS = {
+    source: {field: _compile_selector(*selector) for field, selector in selectors.items()}
+    for source, selectors in CARD_SELECTORS.items()
+}
+PARSER_BACKEND = _resolve_html_parser(HTML_PARSER)
+
+# Bump when parse_*_page output changes, so stale cached results aren't reused
+PARSER_VERSION = 3
+
+# Cached parse results are only reused while the selectors and parse config are unchanged
+PARSE_CONFIG_KEY = hashlib.sha1(
+    json.dumps([PARSER_VERSION, CARD_SELECTORS, LOCATION]).encode()
+).hexdigest()[:12]
+
+def extract_cards(source, content, limit=None):
+    """Parse a results page and return one {field: element or None} dict per job card"""
+    selectors = COMPILED_SELECTORS[source]
+    card_selector = selectors['card']
+    soup = BeautifulSoup(content, PARSER_BACKEND, parse_only=card_selector if PARSE_ONLY_CARDS else None)
+    return [
+        {field: card.find(selector) for field, selector in selectors.items() if field != 'card'}
+        for card in soup.find_all(card_selector, limit=limit)
+    ]
+
+# ============================================
+# PAGINATED CRAWL
+# ============================================
+
+# Set by the daemon's SIGTERM handler; crawls stop at the next page boundary
+SHUTDOWN = threading.Event()
+
+def fetch_page_jobs(url, source):
+    """Fetch one results page and return its jobs, reusing cached parse results"""
+    # Cached on disk, then pooled, rate limited and retried
+    content, content_hash, status = HTTP_CACHE.fetch(url)
+    METRICS.page(status, len(content))
+    if status != 200:
+        return []  # Error pages have no cards; don't spend a parse on them
+    parsed_key = f"{content_hash}:{PARSE_CONFIG_KEY}" if content_hash else None
+    cached_jobs = HTTP_CACHE.parsed_jobs(url, parsed_key)
+    if cached_jobs is not None:
+        return cached_jobs  # Page unchanged since last run: skip parsing (scoring still runs)
     
-    # Nice to have (5 points each)
-    for skill in NICE_TO_HAVE:
-        if skill.lower() in text:
-            score += 5
+    # Parsing is CPU-bound, so it runs in a worker process while this thread waits
+    jobs, cards, dropped = PARSE_POOL.parse(source, content)
+    METRICS.cards(cards, dropped)
+    HTTP_CACHE.store_parsed(url, parsed_key, jobs)
+    return jobs
+
+def crawl_pages(source, job_title, build_url, seen_store=None):
+    """Walk a query's result pages, stopping at the page budget or once pages are mostly known jobs"""
+    jobs = []
     
-    # Leadership keywords
-    leadership_keywords = ["lead", "manage", "director", "mentor", "team"]
-    for keyword in leadership_keywords:
-        if keyword in text:
-            score += 3
+    with METRICS.query(job_title, source) as query_metrics:
+        try:
+            _crawl(source, job_title, build_url, seen_store, jobs)
+            # Safe to checkpoint unless stopped early or a page came back as a server error
+            query_metrics['complete'] = not SHUTDOWN.is_set() and all(
+                int(status) < 500 for status in query_metrics['statuses'])
+        except CircuitOpenError:
+            METRICS.add('queries_blocked')  # Announced once by the breaker
+        except Exception as e:
+            METRICS.error()
+            print(f"Error searching {source} for {job_title}: {e}")
+        query_metrics['jobs'] = len(jobs)
     
-    return min(score, 100)  # Cap at 100
+    return jobs
+
+def _crawl(source, job_title, build_url, seen_store, jobs):
+    """Page loop for crawl_pages; appends to jobs so earlier pages survive a failure"""
+    for page in range(MAX_PAGES_PER_QUERY):
+        if SHUTDOWN.is_set():
+            break  # Daemon is stopping: keep what we have
+        page_jobs = fetch_page_jobs(build_url(job_title, page), source)
+        jobs.extend(page_jobs)
+        if not page_jobs:
+            break  # Past the last page of results
+        
+        # Results are newest first, so a page of known jobs means the rest are old news
+        if page_is_stale(page_jobs, seen_store):
+            break
+
+def page_is_stale(page_jobs, seen_store):
+    """True if at least SEEN_STOP_RATIO of a page's jobs are in seen_store"""
+    if seen_store is None:
+        return False
+    known = sum(1 for job in page_jobs if job['job_id'] in seen_store)
+    return known >= SEEN_STOP_RATIO * len(page_jobs)
 
 # ============================================
 # INDEED SCRAPER
 # ============================================
 
-def search_indeed(job_title):
-    """Search Indeed for jobs"""
+INDEED_PAGE_SIZE = 10  # Step of Indeed's start= parameter
+
+def indeed_search_url(job_title, page=0, location=LOCATION):
+    """Build the Indeed search URL for a results page"""
+    query = f"{job_title} {JOB_TYPE}"
+    url = f"{INDEED_BASE_URL}/jobs?q={quote_plus(query)}&l={quote_plus(location)}&radius={SEARCH_RADIUS}&fromage={POSTED_WITHIN_DAYS}"
+    if page:
+        url += f"&start={page * INDEED_PAGE_SIZE}"
+    return url
+
+def parse_indeed_page(content):
+    """Extract jobs from an Indeed results page; returns (jobs, cards found, cards dropped)"""
     jobs = []
+    dropped = 0
     
-    try:
-        # Build Indeed search URL
-        query = f"{job_title} {JOB_TYPE}"
-        url = f"https://www.indeed.com/jobs?q={quote_plus(query)}&l={quote_plus(LOCATION)}&radius={SEARCH_RADIUS}&fromage={POSTED_WITHIN_DAYS}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find job cards (Indeed's HTML structure)
-        job_cards = soup.find_all('div', class_='job_seen_beacon')
-        
-        for card in job_cards[:10]:  # Limit to top 10 per search
-            try:
-                # Extract job details
-                title_elem = card.find('h2', class_='jobTitle')
-                company_elem = card.find('span', {'data-testid': 'company-name'})
-                location_elem = card.find('div', {'data-testid': 'text-location'})
+    # Find job cards (Indeed's HTML structure, see CARD_SELECTORS)
+    job_cards = extract_cards('Indeed', content)
+    
+    for card in job_cards:
+        try:
+            # Extract job details
+            title_elem = card['title']
+            company_elem = card['company']
+            location_elem = card['location']
+            
+            if title_elem and company_elem:
+                title = title_elem.get_text(strip=True)
+                company = company_elem.get_text(strip=True)
+                location = location_elem.get_text(strip=True) if location_elem else LOCATION
                 
-                if title_elem and company_elem:
-                    title = title_elem.get_text(strip=True)
-                    company = company_elem.get_text(strip=True)
-                    location = location_elem.get_text(strip=True) if location_elem else LOCATION
-                    
-                    # Get job link
-                    link_elem = title_elem.find('a')
-                    job_id = link_elem.get('data-jk', '') if link_elem else ''
-                    job_url = f"https://www.indeed.com/viewjob?jk={job_id}" if job_id else ""
-                    
-                    # Get description snippet
-                    desc_elem = card.find('div', class_='job-snippet')
-                    description = desc_elem.get_text(strip=True) if desc_elem else ""
-                    
-                    # Calculate match score
-                    match_score = calculate_match_score(title, description)
-                    
-                    jobs.append({
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'url': job_url,
-                        'description': description[:300],  # First 300 chars
-                        'source': 'Indeed',
-                        'match_score': match_score,
-                        'job_id': f"indeed_{job_id}"
-                    })
-            except Exception as e:
-                continue
-        
-        time.sleep(2)  # Be respectful, don't hammer the server
-        
-    except Exception as e:
-        print(f"Error searching Indeed for {job_title}: {e}")
+                # Get job link
+                link_elem = title_elem.find('a')
+                job_id = link_elem.get('data-jk', '') if link_elem else ''
+                job_url = f"https://www.indeed.com/viewjob?jk={job_id}" if job_id else ""
+                job_id = job_id or fallback_job_id(title, company, location)
+                
+                # Get description snippet
+                desc_elem = card['description']
+                description = desc_elem.get_text(strip=True) if desc_elem else ""
+                
+                jobs.append(Job(
+                    title=title,
+                    company=company,
+                    location=location,
+                    url=job_url,
+                    description=description[:300],  # First 300 chars
+                    source='Indeed',
+                    match_score=0,  # Set by score_jobs()
+                    job_id=f"indeed_{job_id}"
+                ))
+        except Exception as e:
+            dropped += 1
+            continue
     
-    return jobs
+    return jobs, len(job_cards), dropped
+
+def search_indeed(job_title, seen_store=None):
+    """Search Indeed for jobs"""
+    return crawl_pages('Indeed', job_title, indeed_search_url, seen_store)
 
 # ============================================
 # LINKEDIN SCRAPER
 # ============================================
 
-def search_linkedin(job_title):
-    """Search LinkedIn for jobs"""
+LINKEDIN_PAGE_SIZE = 25  # Step of LinkedIn's start= parameter
+LINKEDIN_PLACEHOLDER_DESCRIPTION = 'Click to view full description on LinkedIn'
+
+def linkedin_search_url(job_title, page=0, location=LOCATION):
+    """Build the LinkedIn (public job search) URL for a results page"""
+    query = f"{job_title} {JOB_TYPE}"
+    url = f"{LINKEDIN_BASE_URL}/jobs/search/?keywords={quote_plus(query)}&location={quote_plus(location)}&distance={SEARCH_RADIUS}&f_TPR=r{POSTED_WITHIN_DAYS*86400}"
+    if page:
+        url += f"&start={page * LINKEDIN_PAGE_SIZE}"
+    return url
+
+def parse_linkedin_page(content):
+    """Extract jobs from a LinkedIn results page; returns (jobs, cards found, cards dropped)"""
     jobs = []
+    dropped = 0
+    
+    # Find job cards (see CARD_SELECTORS)
+    job_cards = extract_cards('LinkedIn', content)
+    
+    for card in job_cards:
+        try:
+            title_elem = card['title']
+            company_elem = card['company']
+            location_elem = card['location']
+            link_elem = card['link']
+            
+            if title_elem and company_elem and link_elem:
+                title = title_elem.get_text(strip=True)
+                company = company_elem.get_text(strip=True)
+                location = location_elem.get_text(strip=True) if location_elem else LOCATION
+                job_url = link_elem.get('href', '')
+                
+                # Extract job ID from URL (/jobs/view/123 or /jobs/view/some-title-at-co-123)
+                job_id_match = re.search(r'/jobs/view/(?:[^/?#]*-)?(\d+)(?:[/?#]|$)', job_url)
+                if job_id_match:
+                    job_id = job_id_match.group(1)
+                else:
+                    job_id = fallback_job_id(title, company, location)
+                
+                jobs.append(Job(
+                    title=title,
+                    company=company,
+                    location=location,
+                    url=job_url,
+                    description=LINKEDIN_PLACEHOLDER_DESCRIPTION,
+                    source='LinkedIn',
+                    match_score=0,  # Set by score_jobs()
+                    job_id=f"linkedin_{job_id}"
+                ))
+        except Exception as e:
+            dropped += 1
+            continue
+    
+    return jobs, len(job_cards), dropped
+
+def search_linkedin(job_title, seen_store=None):
+    """Search LinkedIn for jobs"""
+    return crawl_pages('LinkedIn', job_title, linkedin_search_url, seen_store)
+
+# ============================================
+# LINKEDIN DESCRIPTION ENRICHMENT
+# ============================================
+
+LINKEDIN_DESCRIPTION_SELECTOR = _compile_selector('div', {'class': 'show-more-less-html__markup'})
+
+class DescriptionCache:
+    """Full job descriptions by job ID, stored in SQLite next to the seen-jobs tables.
+
+    A posting's description is fetched once and reused by later runs until
+    it is SEEN_JOBS_TTL_DAYS old.
+    """
+
+    def __init__(self, path, ttl_days):
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_descriptions (
+                job_id TEXT PRIMARY KEY,
+                description TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("DELETE FROM job_descriptions WHERE fetched_at < ?", (time.time() - ttl_days * 86400,))
+
+    def get_many(self, job_ids):
+        """Cached descriptions for the given IDs, as {job_id: description}"""
+        descriptions = {}
+        for job_id in job_ids:
+            row = self._conn.execute("SELECT description FROM job_descriptions WHERE job_id = ?", (job_id,)).fetchone()
+            if row:
+                descriptions[job_id] = row[0]
+        return descriptions
+
+    def put_many(self, descriptions):
+        """Store {job_id: description}"""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO job_descriptions (job_id, description, fetched_at) VALUES (?, ?, ?)",
+            [(job_id, description, now) for job_id, description in descriptions.items()],
+        )
+        self._conn.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+def linkedin_posting_url(job_id):
+    """Public (guest) URL of a LinkedIn posting's details, by numeric job ID"""
+    return f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/jobPosting/{job_id}"
+
+def parse_linkedin_description(content):
+    """Description text of a LinkedIn posting page ('' if it has none)"""
+    soup = BeautifulSoup(content, PARSER_BACKEND, parse_only=LINKEDIN_DESCRIPTION_SELECTOR)
+    description_elem = soup.find(LINKEDIN_DESCRIPTION_SELECTOR)
+    return description_elem.get_text(' ', strip=True) if description_elem else ''
+
+def fetch_linkedin_description(job_id):
+    """Fetch one posting's description; '' on failure"""
+    try:
+        response = HTTP_CLIENT.get(linkedin_posting_url(job_id.split('_', 1)[1]))
+        if response.status_code != 200:
+            return ''
+        return parse_linkedin_description(response.content)
+    except CircuitOpenError:
+        return ''
+    except Exception as e:
+        print(f"⚠️  Could not fetch description for {job_id}: {e}")
+        return ''
+
+def _passes_title_prefilter(title, keywords):
+    padded = f" {normalize_title(title)} "
+    return any(f" {keyword} " in padded for keyword in keywords)
+
+def enrichment_candidates(jobs, seen_store):
+    """LinkedIn job IDs worth a description fetch, best title score first.
+
+    Only new postings (not in seen_store by ID or fingerprint) whose title
+    passes the ENRICH_TITLE_KEYWORDS prefilter qualify.
+    """
+    keywords = [normalize_title(keyword) for keyword in ENRICH_TITLE_KEYWORDS]
+    best_scores = {}
+    for job in jobs:
+        job_id = job['job_id']
+        if job['source'] != 'LinkedIn' or not job_id.split('_', 1)[1].isdigit():
+            continue  # Fingerprint IDs have no posting page to fetch
+        if job['description'] != LINKEDIN_PLACEHOLDER_DESCRIPTION or job_id in seen_store:
+            continue
+        if not _passes_title_prefilter(job['title'], keywords):
+            continue
+        fingerprint, block, _ = dedup_keys(job)
+        if seen_store.find_duplicate(fingerprint, block) is not None:
+            continue
+        best_scores[job_id] = SKILL_MATCHER.score(job['title'], '')
+    return sorted(best_scores, key=best_scores.get, reverse=True)
+
+def enrich_linkedin_jobs(jobs, seen_store, limit=ENRICH_MAX_JOBS):
+    """Replace placeholder LinkedIn descriptions with the full text, so they're scored on more than the title.
+
+    Descriptions come from the DescriptionCache when possible; the rest are
+    fetched ENRICH_WORKERS at a time (up to limit), through the shared
+    rate-limited client. Returns counts for print_enrichment().
+    """
+    counts = {'candidates': 0, 'enriched': 0, 'cached': 0, 'fetched': 0, 'tried': 0}
+    candidates = enrichment_candidates(jobs, seen_store)
+    if not candidates:
+        return counts
     
+    cache = DescriptionCache(SEEN_JOBS_DB, SEEN_JOBS_TTL_DAYS)
     try:
-        # Build LinkedIn search URL (public job search)
-        query = f"{job_title} {JOB_TYPE}"
-        url = f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(query)}&location={quote_plus(LOCATION)}&distance={SEARCH_RADIUS}&f_TPR=r{POSTED_WITHIN_DAYS*86400}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find job cards
-        job_cards = soup.find_all('div', class_='base-card')
-        
-        for card in job_cards[:10]:  # Limit to top 10 per search
+        descriptions = cache.get_many(candidates)
+        cached = len(descriptions)
+        to_fetch = [job_id for job_id in candidates if job_id not in descriptions][:max(limit, 0)]
+        with ThreadPoolExecutor(max_workers=ENRICH_WORKERS) as executor:
+            fetched = {
+                job_id: description
+                for job_id, description in zip(to_fetch, executor.map(fetch_linkedin_description, to_fetch))
+                if description
+            }
+        cache.put_many(fetched)
+        descriptions.update(fetched)
+    finally:
+        cache.close()
+    
+    for job in jobs:
+        description = descriptions.get(job['job_id'])
+        if description:
+            job['description'] = description  # Trimmed for display after scoring
+    
+    METRICS.add('descriptions_cached', cached)
+    METRICS.add('descriptions_fetched', len(fetched))
+    counts.update(candidates=len(candidates), enriched=len(descriptions), cached=cached,
+                  fetched=len(fetched), tried=len(to_fetch))
+    return counts
+
+def print_enrichment(counts):
+    """Log what enrich_linkedin_jobs() did (counts may be summed over several calls)"""
+    if counts['candidates']:
+        print(f"📝 Enriched {counts['enriched']} LinkedIn jobs ({counts['cached']} cached, "
+              f"{counts['fetched']} fetched of {counts['tried']} tried)")
+
+# ============================================
+# PARSE WORKERS
+# ============================================
+
+PAGE_PARSERS = {
+    'Indeed': parse_indeed_page,
+    'LinkedIn': parse_linkedin_page,
+}
+
+def parse(source, content):
+    """Parse a results page into a list of jobs (no I/O or shared state, so safe in any process)"""
+    return PAGE_PARSERS[source](content)[0]
+
+def parse_with_counts(source, content):
+    """parse(), plus the card counts for the run metrics: (jobs, cards found, cards dropped)"""
+    return PAGE_PARSERS[source](content)
+
+class ParsePool:
+    """Process pool that parses pages for the fetch threads.
+
+    Fetch threads stay I/O-bound: each hands its raw page to a worker
+    process and waits for the jobs. At most queue_size pages are queued
+    or being parsed at once; beyond that fetchers block (backpressure)
+    rather than piling raw pages up in memory. Without workers, or before
+    start(), pages are parsed in the calling thread.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self._executor = None
+
+    def start(self):
+        """Launch the worker processes (call before starting fetch threads); True if this call launched them"""
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor.submit(os.getpid).result()  # Fork now, while only this thread runs
+            return True
+        return False
+
+    def parse(self, source, content):
+        """Parse a page in a worker process; returns (jobs, cards found, cards dropped)"""
+        executor = self._executor
+        if executor is None:
+            return parse_with_counts(source, content)
+        try:
+            with self._slots:
+                return executor.submit(parse_with_counts, source, content).result()
+        except BrokenProcessPool:
+            print("⚠️  Parse workers died, parsing in the fetch threads for the rest of the run")
+            self._executor = None
+            return parse_with_counts(source, content)
+
+    def close(self):
+        """Shut the worker processes down"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+# Shared by all searches, so the number of parse processes is fixed per run
+PARSE_POOL = ParsePool(PARSE_WORKERS, PARSE_QUEUE_SIZE)
+
+# ============================================
+# CONCURRENT FETCH ENGINE
+# ============================================
+
+SOURCES = {
+    'Indeed': search_indeed,
+    'LinkedIn': search_linkedin,
+}
+
+# Results page URL builders, for fetching single pages in work-queue mode
+SEARCH_URLS = {
+    'Indeed': indeed_search_url,
+    'LinkedIn': linkedin_search_url,
+}
+
+# Per-task profiles collected by --profile (the main profiler can't see worker threads)
+_TASK_PROFILES = None
+
+def _run_search(search, job_title, seen_store):
+    """Run one search, under its own profiler when --profile is active"""
+    if _TASK_PROFILES is None:
+        return search(job_title, seen_store)
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(search, job_title, seen_store)
+    finally:
+        _TASK_PROFILES.append(profile)
+
+def _checkpointed_search(search, key, seen_store, journal):
+    """Run one search and, if it finished cleanly, checkpoint it from the search thread.
+
+    Checkpointing here rather than where results are consumed means a
+    finished search is on disk even while the consumer is still busy
+    with earlier chunks (e.g. fetching LinkedIn descriptions).
+    """
+    jobs = _run_search(search, key[0], seen_store)
+    query_metrics = METRICS.queries.get(key, {})
+    if journal is not None and query_metrics.get('complete'):
+        journal.record(key, jobs, query_metrics['pages'])
+        HTTP_CACHE.save()  # So a resumed run finds the pages behind the checkpoint cached too
+    return jobs
+
+def stream_queries(queries, seen_store=None, journal=None):
+    """Run the given (title, source) searches concurrently, yielding (key, jobs) as each one finishes.
+
+    Each search pages through results until most of a page is already in
+    seen_store.
+    Politeness is handled by RATE_LIMITER, so wall time is bounded by the
+    slowest host rather than by the number of titles. Fetching runs on
+    threads; parsing is handed to PARSE_POOL's processes so it scales with
+    cores instead of serializing on the GIL. Nothing is kept once a
+    query's jobs are yielded, so downstream stages see the first results
+    while later queries are still fetching. With a journal, every query
+    that finishes cleanly is checkpointed as soon as it completes, whether
+    or not its jobs have been consumed yet.
+    """
+    started_pool = PARSE_POOL.start()  # Already running (and kept) in daemon mode
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(_checkpointed_search, SOURCES[source], (job_title, source), seen_store, journal):
+                    (job_title, source)
+                for job_title, source in queries
+            }
+            for future in as_completed(futures):
+                key = futures.pop(future)
+                try:
+                    jobs = future.result()
+                except Exception as e:
+                    print(f"Error searching {key[1]} for {key[0]}: {e}")
+                    yield key, []
+                    continue
+                del future  # Only the consumer holds the jobs now
+                yield key, jobs
+    finally:
+        if started_pool:
+            PARSE_POOL.close()
+
+def search_queries(queries, seen_store=None, journal=None):
+    """stream_queries() collected into a dict mapping (job_title, source) to jobs, in query order"""
+    results = dict(stream_queries(queries, seen_store, journal))
+    return {key: results[key] for key in queries}
+
+# ============================================
+# RUN JOURNAL
+# ============================================
+
+class RunJournal:
+    """Checkpoints of a run's fetched and parsed results, one JSON line per finished query.
+
+    Lines are appended and fsynced as each (title, source) query completes,
+    so a run that crashes or is killed keeps everything fetched so far; a
+    torn last line is ignored. `--resume` reuses queries finished within
+    RESUME_WINDOW_MINUTES instead of fetching them again. The journal is
+    deleted once a run has reported its jobs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def open(self, resume=False, window_minutes=RESUME_WINDOW_MINUTES):
+        """Start journaling; returns {(title, source): (jobs, pages)} of fresh checkpoints when resuming"""
+        done = {}
+        if resume:
+            cutoff = time.time() - window_minutes * 60
             try:
-                title_elem = card.find('h3', class_='base-search-card__title')
-                company_elem = card.find('h4', class_='base-search-card__subtitle')
-                location_elem = card.find('span', class_='job-search-card__location')
-                link_elem = card.find('a', class_='base-card__full-link')
-                
-                if title_elem and company_elem and link_elem:
-                    title = title_elem.get_text(strip=True)
-                    company = company_elem.get_text(strip=True)
-                    location = location_elem.get_text(strip=True) if location_elem else LOCATION
-                    job_url = link_elem.get('href', '')
-                    
-                    # Extract job ID from URL
-                    job_id_match = re.search(r'/jobs/view/(\d+)', job_url)
-                    job_id = job_id_match.group(1) if job_id_match else ''
-                    
-                    # Calculate match score (description not available in listing)
-                    match_score = calculate_match_score(title, "")
-                    
-                    jobs.append({
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'url': job_url,
-                        'description': 'Click to view full description on LinkedIn',
-                        'source': 'LinkedIn',
-                        'match_score': match_score,
-                        'job_id': f"linkedin_{job_id}"
-                    })
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # Torn write from the crash
+                        if entry['finished_at'] >= cutoff:
+                            jobs = [Job.from_dict(job) for job in entry['jobs']]
+                            done[(entry['title'], entry['source'])] = (jobs, entry['pages'])
+            except OSError:
+                pass
+        # Rewrite the journal with just the checkpoints still in use, then append to it
+        with atomic_write(self.path, 'w') as f:
+            for (job_title, source), (jobs, pages) in done.items():
+                f.write(self._line(job_title, source, jobs, pages))
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return done
+
+    @staticmethod
+    def _line(job_title, source, jobs, pages):
+        entry = {'title': job_title, 'source': source, 'pages': pages, 'finished_at': time.time(),
+                 'jobs': [job.to_dict() for job in jobs]}
+        return json.dumps(entry) + "\n"
+
+    def record(self, key, jobs, pages):
+        """Checkpoint one finished query"""
+        line = self._line(key[0], key[1], jobs, pages)
+        with self._lock:
+            try:
+                self._file.write(line)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                print(f"⚠️  Could not checkpoint {key[1]} / {key[0]}: {e}")
+
+    def finish(self):
+        """The run completed: drop the journal"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        """Stop journaling, keeping the file for --resume"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+# ============================================
+# QUERY PLANNER
+# ============================================
+
+class QueryPlanner:
+    """Plans fewer searches by learning how much JOB_TITLES' results overlap.
+
+    On calibration runs every title is searched separately, and for each
+    source and pair of titles (A, B) the planner keeps a moving average of
+    the share of A's job IDs that B also returned. Other runs then:
+      - skip a title whose results another title covers (QUERY_COVERED_RATIO)
+      - OR together titles that overlap by QUERY_MERGE_RATIO or more, on
+        sources listed in QUERY_OR_SYNTAX
+    Stats are kept in QUERY_STATS_FILE along with each title's average
+    result and page counts; broader titles are kept in preference to the
+    ones they cover, and page counts estimate the requests a plan saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {'runs': 0, 'sources': {}}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.state = json.load(f)
             except Exception as e:
-                continue
+                print(f"⚠️  Could not load {path}: {e}")
+        self.skipped = []  # (title, source, covered_by) in the last plan
+
+    def _stats(self, source):
+        stats = self.state['sources'].setdefault(source, {})
+        for key in ('contained', 'pages', 'results'):
+            stats.setdefault(key, {})
+        return stats
+
+    def _contained(self, source, a, b):
+        """Average share of a's results also returned for b, or None while unknown"""
+        return self._stats(source)['contained'].get(a, {}).get(b)
+
+    def calibrating(self, job_titles):
+        """Whether this run should search every title separately"""
+        if self.state['runs'] % QUERY_CALIBRATE_EVERY == 0:
+            return True
+        # A title that has only ever come back empty can't be measured; it is simply searched on its own
+        return any(
+            self._contained(source, a, b) is None
+            for source in SOURCES for a in job_titles for b in job_titles
+            if a != b and self._stats(source)['results'].get(a) != 0
+        )
+
+    def plan(self, job_titles):
+        """Return the searches to run as (query, source, titles) tuples"""
+        self.skipped = []
+        if self.calibrating(job_titles):
+            return [(title, source, [title]) for title in job_titles for source in SOURCES]
+        
+        plan = []
+        for source in SOURCES:
+            # Drop titles a kept title already covers, considering the broadest titles first
+            sizes = self._stats(source)['results']
+            kept = []
+            for title in sorted(job_titles, key=lambda t: -sizes.get(t, 0)):
+                cover = next(
+                    (other for other in kept if (self._contained(source, title, other) or 0) >= QUERY_COVERED_RATIO),
+                    None,
+                )
+                if cover is None:
+                    kept.append(title)
+                else:
+                    self.skipped.append((title, source, cover))
+            
+            # OR together titles whose results overlap a lot
+            groups = []
+            for title in kept:
+                group = next(
+                    (g for g in groups
+                     if source in QUERY_OR_SYNTAX and len(g) < QUERY_MERGE_MAX_TITLES
+                     and all(max(self._contained(source, title, member) or 0, self._contained(source, member, title) or 0)
+                             >= QUERY_MERGE_RATIO for member in g)),
+                    None,
+                )
+                if group is None:
+                    groups.append([title])
+                else:
+                    group.append(title)
+            for group in groups:
+                if len(group) == 1:
+                    plan.append((group[0], source, group))
+                else:
+                    query = QUERY_OR_SYNTAX[source].join(f'"{title}"' for title in group)
+                    plan.append((f"({query})", source, group))
+        return plan
+
+    def record(self, plan, found_ids, page_counts, complete):
+        """Update overlap and page stats from a run; returns the estimated requests saved.
+
+        found_ids: job IDs per (query, source); complete: the queries that
+        fetched at least one page without errors. Overlap is only measured
+        between complete queries, since an empty result from a failed or
+        blocked search would read as "covered by everything".
+        """
+        calibration = all(len(titles) == 1 for _, _, titles in plan) and not self.skipped
+        weight = QUERY_STATS_WEIGHT
+        saved = 0.0
         
-        time.sleep(2)  # Be respectful
+        for source in SOURCES:
+            stats = self._stats(source)
+            ids = {
+                query: found_ids.get((query, source), set())
+                for query, query_source, _ in plan if query_source == source
+            }
+            for query, query_source, titles in plan:
+                if query_source != source:
+                    continue
+                pages = page_counts.get((query, source), 0)
+                if len(titles) == 1:
+                    previous = stats['pages'].get(query)
+                    stats['pages'][query] = pages if previous is None else (1 - weight) * previous + weight * pages
+                else:
+                    saved += sum(stats['pages'].get(title, 1) for title in titles) - pages
+                
+                if calibration and (query, source) in complete:
+                    previous = stats['results'].get(query)
+                    count = len(ids[query])
+                    stats['results'][query] = count if previous is None else (1 - weight) * previous + weight * count
+                    contained = stats['contained'].setdefault(query, {})
+                    for other, other_ids in ids.items():
+                        if other == query or not ids[query] or (other, source) not in complete:
+                            continue  # Nothing to measure: the share stays unknown
+                        share = len(ids[query] & other_ids) / len(ids[query])
+                        previous = contained.get(other)
+                        contained[other] = share if previous is None else (1 - weight) * previous + weight * share
+            
+            saved += sum(stats['pages'].get(title, 1) for title, skip_source, _ in self.skipped if skip_source == source)
         
-    except Exception as e:
-        print(f"Error searching LinkedIn for {job_title}: {e}")
-    
-    return jobs
+        self.state['runs'] += 1
+        return saved
+
+    def print_plan(self, plan, job_titles):
+        """Log how the plan differs from searching every title on every source"""
+        merged = [query for query, _, titles in plan if len(titles) > 1]
+        if not merged and not self.skipped:
+            print(f"🧭 Query plan: all {len(plan)} searches run separately (calibration run)"
+                  if self.calibrating(job_titles) else f"🧭 Query plan: {len(plan)} searches")
+            return
+        print(f"🧭 Query plan: {len(plan)} searches instead of {len(job_titles) * len(SOURCES)}")
+        for query, source, titles in plan:
+            if len(titles) > 1:
+                print(f"  - {source}: merged {query}")
+        for title, source, cover in self.skipped:
+            print(f"  - {source}: skipped \"{title}\" (covered by \"{cover}\")")
+
+    def save(self):
+        """Write the stats file"""
+        with atomic_write(self.path) as f:
+            json.dump(self.state, f, indent=2)
 
 # ============================================
-# DESKTOP NOTIFICATION & HTML GENERATION
+# NOTIFICATION OUTBOX
 # ============================================
 
-def send_desktop_notification(jobs):
-    """Send macOS desktop notification for new jobs"""
-    if not jobs:
-        print("No new jobs found. Skipping notification.")
-        return
-    
-    # Sort jobs by match score
-    jobs.sort(key=lambda x: x['match_score'], reverse=True)
-    
+NOTIFY_JOB_FIELDS = ('job_id', 'title', 'company', 'location', 'url', 'source', 'match_score')
+
+def notification_text(jobs, label=None):
+    """(title, message) for a notification about jobs sorted by match score"""
     # Get top 3 jobs for notification preview
     top_jobs = jobs[:3]
     
     title = f"{len(jobs)} New Jobs Found!"
+    if label:
+        title = f"{label}: {title}"
     
     # Build notification message (simplified for notification)
     if len(jobs) == 1:
@@ -244,131 +2458,470 @@ def send_desktop_notification(jobs):
     else:
         # For 3+ jobs, just show the top match and count
         message = f"{top_jobs[0]['title']} at {top_jobs[0]['company']} and {len(jobs)-1} more"
-    
-    # Use osascript (AppleScript) for notification
-    try:
-        # Escape quotes in the message
-        safe_title = title.replace('"', '\\"').replace("'", "\\'")
-        safe_message = message.replace('"', '\\"').replace("'", "\\'")
+    return title, message
+
+def notification_body(jobs, report_path=None):
+    """Plain-text job list for email and file notifications"""
+    lines = []
+    for job in jobs[:NOTIFY_MAX_LISTED]:
+        lines.append(f"{job['match_score']}%  {job['title']} at {job['company']} ({job['location']}, {job['source']})")
+        lines.append(f"      {job['url']}")
+    if len(jobs) > NOTIFY_MAX_LISTED:
+        lines.append(f"...and {len(jobs) - NOTIFY_MAX_LISTED} more")
+    if report_path:
+        lines.extend(["", f"Full report: {report_path}"])
+    return "\n".join(lines)
+
+class Notifier:
+    """A delivery channel. send() raises on failure so the outbox can retry."""
+
+    name = None
+
+    def problem(self):
+        """Why this channel can't be used as configured, or None"""
+        return None
+
+    def send(self, jobs, report_path=None, label=None):
+        raise NotImplementedError
+
+    def close(self):
+        """Release connections"""
+
+class DesktopNotifier(Notifier):
+    """macOS Notification Center via osascript, or notify-send on Linux"""
+
+    name = 'desktop'
+
+    def __init__(self):
+        self.command = shutil.which('osascript') or shutil.which('notify-send')
+
+    def problem(self):
+        return None if self.command else "needs osascript (macOS) or notify-send (Linux)"
+
+    def send(self, jobs, report_path=None, label=None):
+        title, message = notification_text(jobs, label)
+        if os.path.basename(self.command) == 'osascript':
+            # Escape quotes in the message
+            safe_title = title.replace('"', '\\"').replace("'", "\\'")
+            safe_message = message.replace('"', '\\"').replace("'", "\\'")
+            script = f'''display notification "{safe_message}" with title "{safe_title}" sound name "Ping"'''
+            subprocess.run([self.command, '-e', script], check=True, timeout=READ_TIMEOUT)
+        else:
+            subprocess.run([self.command, title, message], check=True, timeout=READ_TIMEOUT)
+
+class FileNotifier(Notifier):
+    """Appends one JSON line per notification, for scripts (or tests) to pick up"""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, jobs, report_path=None, label=None):
+        title, message = notification_text(jobs, label)
+        entry = {'sent_at': datetime.now().isoformat(timespec='seconds'), 'title': title, 'message': message,
+                 'report': report_path, 'jobs': jobs}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+class WebhookNotifier(Notifier):
+    """POSTs JSON to a webhook; the "text" field works with Slack and Discord-style incoming webhooks"""
+
+    name = 'webhook'
+
+    def __init__(self, url):
+        self.url = url
+        self._session = requests.Session()  # Keep-alive across batches (and daemon polls)
+
+    def problem(self):
+        return None if self.url else "set JOBS_WEBHOOK_URL"
+
+    def send(self, jobs, report_path=None, label=None):
+        title, message = notification_text(jobs, label)
+        payload = {'text': f"{title} {message}", 'title': title, 'report': report_path, 'jobs': jobs}
+        response = self._session.post(self.url, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        response.raise_for_status()
+
+    def close(self):
+        self._session.close()
+
+class SendGridNotifier(Notifier):
+    """Email through SendGrid's v3 mail/send API"""
+
+    name = 'sendgrid'
+
+    def __init__(self, api_key, url, sender, recipient):
+        self.url = url
+        self.sender = sender
+        self.recipient = recipient
+        self._session = requests.Session()
+        self._session.headers.update({'Authorization': f"Bearer {api_key}"})
+        self._configured = bool(api_key)
+
+    def problem(self):
+        if not (self._configured and self.sender and self.recipient):
+            return "set SENDGRID_API_KEY, SENDER_EMAIL and RECIPIENT_EMAIL"
+        return None
+
+    def send(self, jobs, report_path=None, label=None):
+        title, _ = notification_text(jobs, label)
+        payload = {
+            'personalizations': [{'to': [{'email': self.recipient}]}],
+            'from': {'email': self.sender},
+            'subject': title,
+            'content': [{'type': 'text/plain', 'value': notification_body(jobs, report_path)}],
+        }
+        response = self._session.post(self.url, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        response.raise_for_status()
+
+    def close(self):
+        self._session.close()
+
+class SmtpNotifier(Notifier):
+    """Email over SMTP; the connection stays open between batches and reconnects when dropped"""
+
+    name = 'smtp'
+
+    def __init__(self, host, port, user, password, starttls, sender, recipient):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.starttls = starttls
+        self.sender, self.recipient = sender, recipient
+        self._smtp = None
+
+    def problem(self):
+        if not (self.host and self.sender and self.recipient):
+            return "set SMTP_HOST, SENDER_EMAIL and RECIPIENT_EMAIL"
+        return None
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=READ_TIMEOUT)
+        if self.starttls:
+            smtp.starttls()
+        if self.user:
+            smtp.login(self.user, self.password or '')
+        return smtp
+
+    def send(self, jobs, report_path=None, label=None):
+        title, _ = notification_text(jobs, label)
+        message = EmailMessage()
+        message['Subject'] = title
+        message['From'] = self.sender
+        message['To'] = self.recipient
+        message.set_content(notification_body(jobs, report_path))
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = self._connect()  # Idle connection was dropped: one fresh attempt
+            self._smtp.send_message(message)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+NOTIFIER_TYPES = {
+    'desktop': lambda: DesktopNotifier(),
+    'file': lambda: FileNotifier(NOTIFY_FILE),
+    'webhook': lambda: WebhookNotifier(NOTIFY_WEBHOOK_URL),
+    'sendgrid': lambda: SendGridNotifier(SENDGRID_API_KEY, SENDGRID_API_URL, SENDER_EMAIL, RECIPIENT_EMAIL),
+    'smtp': lambda: SmtpNotifier(SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD, SMTP_STARTTLS,
+                                 SENDER_EMAIL, RECIPIENT_EMAIL),
+}
+
+def build_notifiers(names):
+    """Notifier instances for the configured channel names, skipping ones that aren't set up"""
+    notifiers = {}
+    for name in names:
+        factory = NOTIFIER_TYPES.get(name)
+        if factory is None:
+            print(f"⚠️  Unknown notifier {name!r} (choose from {', '.join(NOTIFIER_TYPES)})")
+            continue
+        notifier = factory()
+        problem = notifier.problem()
+        if problem:
+            print(f"⚠️  {name} notifications are off: {problem}")
+            continue
+        notifiers[name] = notifier
+    return notifiers
+
+class NotificationOutbox:
+    """Persistent notification queue (SQLite), delivered by a background thread.
+
+    enqueue() only writes a row per channel and returns, so a run never
+    waits on osascript, SMTP or a webhook. The worker holds new rows for
+    NOTIFY_BATCH_SECONDS, then coalesces everything pending for a channel
+    and recipient (including leftovers from earlier runs) into one
+    notification. Failed sends are retried with exponential backoff, up to
+    NOTIFY_MAX_ATTEMPTS. close() gives the worker NOTIFY_FLUSH_SECONDS to
+    send what's queued; anything left goes out with the next run.
+    """
+
+    def __init__(self, path, channel_names):
+        self.path = path
+        self.channel_names = channel_names
+        self.notifiers = {}
+        self._conn = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flush = False
+        self._thread = None
+
+    def start(self):
+        """Open the outbox and start delivering; returns True if this call started it"""
+        if self._thread is not None:
+            return False
+        self.notifiers = build_notifiers(self.channel_names)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY,
+                channel TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                last_error TEXT
+            )
+        """)
+        self._conn.execute("DELETE FROM outbox WHERE created < ?", (time.time() - NOTIFY_MAX_AGE_DAYS * 86400,))
+        self._flush = False
+        self._thread = threading.Thread(target=self._run, name="notify-outbox", daemon=True)
+        self._thread.start()
+        return True
+
+    def enqueue(self, jobs, report_path=None, label=None):
+        """Queue a notification about jobs on every channel; returns without waiting for delivery"""
+        self.start()
+        if not self.notifiers:
+            print("No notifiers configured. Skipping notification.")
+            return
+        payload = json.dumps({
+            'jobs': [{key: job.get(key) for key in NOTIFY_JOB_FIELDS} for job in jobs],
+            'report': report_path,
+            'label': label,
+        })
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT INTO outbox (channel, payload, created, next_attempt) VALUES (?, ?, ?, ?)",
+                [(channel, payload, now, now + NOTIFY_BATCH_SECONDS) for channel in self.notifiers],
+            )
+            self._conn.execute("COMMIT")
+        self._wake.set()
+        print(f"📬 Queued notification for {len(jobs)} jobs ({', '.join(self.notifiers)})")
+
+    def _run(self):
+        """Worker loop: deliver what's due, then sleep until the next row is due or more arrive"""
+        while True:
+            self._wake.clear()
+            flushing = self._flush
+            try:
+                next_due = self._deliver_due(flushing)
+            except Exception as e:
+                print(f"⚠️  Notification outbox error: {e}")
+                next_due = time.time() + NOTIFY_RETRY_SECONDS
+            if flushing:
+                return
+            self._wake.wait(max(0.0, next_due - time.time()) if next_due is not None else None)
+
+    def _deliver_due(self, flushing):
+        """Send each batch that is due (or, when flushing, not yet tried); returns when the next one is due"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, channel, payload, attempts, next_attempt FROM outbox ORDER BY id").fetchall()
+        batches = {}
+        for row_id, channel, payload, attempts, next_attempt in rows:
+            if channel not in self.notifiers:
+                continue  # Channel switched off; dropped after NOTIFY_MAX_AGE_DAYS
+            payload = json.loads(payload)
+            key = (channel, payload['report'], payload['label'])
+            batches.setdefault(key, []).append((row_id, payload, attempts, next_attempt))
         
-        script = f'''display notification "{safe_message}" with title "{safe_title}" sound name "Ping"'''
-        subprocess.run(['osascript', '-e', script], check=True)
-        print(f"✅ Desktop notification sent for {len(jobs)} jobs!")
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️  Could not send desktop notification: {e}")
-    except Exception as e:
-        print(f"⚠️  Error with notification: {e}")
+        next_due = None
+        for (channel, report_path, label), batch in batches.items():
+            ready = any(next_attempt <= now for _, _, _, next_attempt in batch) or (
+                flushing and any(attempts == 0 for _, _, attempts, _ in batch))
+            if not ready:
+                due = min(next_attempt for _, _, _, next_attempt in batch)
+                next_due = due if next_due is None else min(next_due, due)
+                continue
+            # Coalesce: one notification per channel and recipient, best matches first
+            jobs = {}
+            for _, payload, _, _ in batch:
+                for job in payload['jobs']:
+                    if job['job_id'] not in jobs or job['match_score'] > jobs[job['job_id']]['match_score']:
+                        jobs[job['job_id']] = job
+            jobs = sorted(jobs.values(), key=lambda x: x['match_score'], reverse=True)
+            row_ids = [row_id for row_id, _, _, _ in batch]
+            try:
+                self.notifiers[channel].send(jobs, report_path, label)
+            except Exception as e:
+                retry_at = self._failed(channel, batch, e)
+                if retry_at is not None:
+                    next_due = retry_at if next_due is None else min(next_due, retry_at)
+                continue
+            with self._lock:
+                self._conn.execute(f"DELETE FROM outbox WHERE id IN ({','.join('?' * len(row_ids))})", row_ids)
+            coalesced = f", {len(batch)} batches coalesced" if len(batch) > 1 else ""
+            METRICS.add('notifications_sent')
+            print(f"✅ {channel} notification sent for {len(jobs)} jobs{coalesced}")
+        return next_due
 
-def save_jobs_html(jobs):
-    """Save jobs to a local HTML file for easy browsing"""
-    if not jobs:
-        print("No jobs to save to HTML.")
-        return
-    
-    # Sort jobs by match score
-    jobs.sort(key=lambda x: x['match_score'], reverse=True)
-    
-    # Build HTML content
-    html_content = f"""
-<!DOCTYPE html>
+    def _failed(self, channel, batch, error):
+        """Schedule a batch's retry, or give up on it; returns when it will be retried"""
+        attempts = max(attempts for _, _, attempts, _ in batch) + 1
+        row_ids = [row_id for row_id, _, _, _ in batch]
+        placeholders = ','.join('?' * len(row_ids))
+        METRICS.add('notifications_failed')
+        with self._lock:
+            if attempts >= NOTIFY_MAX_ATTEMPTS:
+                self._conn.execute(f"DELETE FROM outbox WHERE id IN ({placeholders})", row_ids)
+                print(f"❌ Giving up on {channel} notification after {attempts} attempts: {error}")
+                return None
+            retry_at = time.time() + NOTIFY_RETRY_SECONDS * 2 ** (attempts - 1)
+            self._conn.execute(
+                f"UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE id IN ({placeholders})",
+                [attempts, retry_at, str(error)] + row_ids,
+            )
+        print(f"⚠️  {channel} notification failed (attempt {attempts} of {NOTIFY_MAX_ATTEMPTS}), will retry: {error}")
+        return retry_at
+
+    def close(self, timeout=None):
+        """Send what's queued (waiting up to timeout, default NOTIFY_FLUSH_SECONDS) and stop the worker"""
+        if self._thread is None:
+            return
+        self._flush = True
+        self._wake.set()
+        self._thread.join(NOTIFY_FLUSH_SECONDS if timeout is None else timeout)
+        if self._thread.is_alive():
+            # Still sending: the daemon thread dies with the process; unsent rows stay queued
+            print("⏳ Notifications still sending; anything undelivered goes out with the next run")
+        else:
+            for notifier in self.notifiers.values():
+                notifier.close()
+            self._conn.close()
+        self._thread = None
+
+# Shared by every mode; started by the first run or enqueue()
+NOTIFY_OUTBOX = NotificationOutbox(NOTIFY_OUTBOX_DB, NOTIFIERS)
+
+# ============================================
+# HTML REPORT
+# ============================================
+
+REPORT_PAGE_HEAD = Template("""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Job Search Results - {datetime.now().strftime('%B %d, %Y')}</title>
+    <title>Job Search Results - $date</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
             line-height: 1.6;
             color: #333;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
-        .header {{
+            display: flex;
+            flex-direction: column;
+        }
+        .header {
+            order: -1;  /* Written after the job list, shown first */
             background: white;
             border-radius: 12px;
             padding: 30px;
             text-align: center;
             margin-bottom: 30px;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #667eea;
             font-size: 32px;
             margin-bottom: 10px;
-        }}
-        .header p {{
+        }
+        .header p {
             color: #666;
             font-size: 18px;
-        }}
-        .stats {{
+        }
+        .stats {
             display: flex;
             justify-content: center;
             gap: 20px;
             margin-top: 20px;
-        }}
-        .stat {{
+        }
+        .stat {
             background: #f8f9fa;
             padding: 10px 20px;
             border-radius: 8px;
-        }}
-        .stat strong {{
+        }
+        .stat strong {
             color: #667eea;
             font-size: 24px;
-        }}
-        .job {{
+        }
+        .job {
             background: white;
             border-radius: 12px;
             padding: 25px;
             margin-bottom: 20px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        .job:hover {{
+        }
+        .job:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
-        .job-header {{
+        }
+        .job-header {
             display: flex;
             justify-content: space-between;
             align-items: start;
             margin-bottom: 15px;
             flex-wrap: wrap;
             gap: 10px;
-        }}
-        .job-title {{
+        }
+        .job-title {
             font-size: 22px;
             font-weight: bold;
             color: #2c3e50;
             margin-bottom: 8px;
-        }}
-        .company {{
+        }
+        .company {
             font-size: 18px;
             color: #555;
             margin-bottom: 8px;
-        }}
-        .company::before {{
+        }
+        .company::before {
             content: "🏢 ";
-        }}
-        .location {{
+        }
+        .location {
             color: #777;
             margin-bottom: 12px;
             font-size: 15px;
-        }}
-        .location::before {{
+        }
+        .location::before {
             content: "📍 ";
-        }}
-        .source {{
+        }
+        .source {
             display: inline-block;
             background: #e9ecef;
             padding: 4px 12px;
@@ -376,28 +2929,28 @@ def save_jobs_html(jobs):
             font-size: 13px;
             color: #495057;
             margin-left: 10px;
-        }}
-        .match-score {{
+        }
+        .match-score {
             display: inline-block;
             padding: 8px 16px;
             border-radius: 6px;
             font-weight: bold;
             font-size: 14px;
             white-space: nowrap;
-        }}
-        .high-match {{
+        }
+        .high-match {
             background-color: #28a745;
             color: white;
-        }}
-        .medium-match {{
+        }
+        .medium-match {
             background-color: #ffc107;
             color: black;
-        }}
-        .low-match {{
+        }
+        .low-match {
             background-color: #6c757d;
             color: white;
-        }}
-        .description {{
+        }
+        .description {
             color: #666;
             margin: 15px 0;
             line-height: 1.6;
@@ -405,8 +2958,8 @@ def save_jobs_html(jobs):
             background: #f8f9fa;
             border-radius: 6px;
             font-size: 15px;
-        }}
-        .apply-btn {{
+        }
+        .apply-btn {
             display: inline-block;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
@@ -416,18 +2969,22 @@ def save_jobs_html(jobs):
             margin-top: 15px;
             font-weight: 600;
             transition: transform 0.2s;
-        }}
-        .apply-btn:hover {{
+        }
+        .apply-btn:hover {
             transform: scale(1.05);
-        }}
-        .footer {{
+        }
+        .apply-btn.secondary {
+            background: #e9ecef;
+            color: #495057;
+        }
+        .footer {
             text-align: center;
             padding: 30px;
             color: white;
             margin-top: 30px;
             font-size: 14px;
-        }}
-        .timestamp {{
+        }
+        .timestamp {
             background: rgba(255,255,255,0.9);
             padding: 10px 20px;
             border-radius: 6px;
@@ -435,160 +2992,1375 @@ def save_jobs_html(jobs):
             display: inline-block;
             color: #667eea;
             font-weight: 600;
-        }}
+        }
+        .pager {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 20px;
+            color: white;
+            font-weight: 600;
+            margin-top: 10px;
+        }
+        .pager a {
+            color: white;
+        }
     </style>
 </head>
 <body>
     <div class="container">
+""")
+
+REPORT_JOB_BLOCK = Template("""
+        <div class="job">
+            <div class="job-header">
+                <div>
+                    <div class="job-title">$title</div>
+                    <div class="company">$company</div>
+                    <div class="location">$location$sources</div>
+                </div>
+                <span class="match-score $score_class">$score_text ($match_score%)</span>
+            </div>
+            <div class="description">$description</div>
+            <a href="$url" class="apply-btn" target="_blank">View & Apply →</a>$other_links
+        </div>
+""")
+
+# Rendered after the job list (when the counts are known); CSS moves it to the top
+REPORT_PAGE_FOOT = Template("""
         <div class="header">
             <h1>🎯 Your Job Search Results</h1>
-            <p>Found {len(jobs)} new opportunities matching your profile</p>
+            <p>Found $total new opportunities matching your profile</p>
             <div class="stats">
                 <div class="stat">
-                    <strong>{len([j for j in jobs if j['match_score'] >= 70])}</strong>
+                    <strong>$excellent</strong>
                     <div>Excellent Matches</div>
                 </div>
                 <div class="stat">
-                    <strong>{len([j for j in jobs if 40 <= j['match_score'] < 70])}</strong>
+                    <strong>$good</strong>
                     <div>Good Matches</div>
                 </div>
                 <div class="stat">
-                    <strong>{len([j for j in jobs if j['match_score'] < 40])}</strong>
+                    <strong>$potential</strong>
                     <div>Potential Matches</div>
                 </div>
             </div>
         </div>
-"""
-    
-    for job in jobs:
-        # Determine match score class and text
-        if job['match_score'] >= 70:
-            score_class = "high-match"
-            score_text = "🔥 Excellent Match"
-        elif job['match_score'] >= 40:
-            score_class = "medium-match"
-            score_text = "✓ Good Match"
-        else:
-            score_class = "low-match"
-            score_text = "• Potential Match"
-        
-        # Escape HTML characters in job data
-        title = job['title'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        company = job['company'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        location = job['location'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        description = job['description'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        
-        html_content += f"""
-        <div class="job">
-            <div class="job-header">
-                <div>
-                    <div class="job-title">{title}</div>
-                    <div class="company">{company}</div>
-                    <div class="location">{location}<span class="source">{job['source']}</span></div>
-                </div>
-                <span class="match-score {score_class}">{score_text} ({job['match_score']}%)</span>
-            </div>
-            <div class="description">{description}</div>
-            <a href="{job['url']}" class="apply-btn" target="_blank">View & Apply →</a>
-        </div>
-"""
-    
-    html_content += f"""
         <div class="footer">
+            $pager
             <p>This is an automated job search digest. Jobs are ranked by match score based on your resume.</p>
-            <div class="timestamp">Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</div>
+            <div class="timestamp">Generated: $generated</div>
         </div>
     </div>
 </body>
 </html>
-"""
+""")
+
+# (minimum score, band, CSS class, label), best band first
+SCORE_BANDS = [
+    (70, 'excellent', "high-match", "🔥 Excellent Match"),
+    (40, 'good', "medium-match", "✓ Good Match"),
+    (0, 'potential', "low-match", "• Potential Match"),
+]
+
+class HtmlReportWriter:
+    """Streams job blocks straight into paginated HTML report files.
+
+    Jobs are written as they arrive, REPORT_JOBS_PER_PAGE to a page, while
+    the score band counts are tallied in the same pass. Each page goes to
+    a temp file next to its destination; close() appends the summary and
+    page navigation (now that the totals are known) and renames every page
+    into place, so a browser or a crash never sees a half-written report.
+    """
+
+    def __init__(self, path, per_page):
+        self.path = path
+        self.per_page = per_page
+        self.generated = datetime.now()
+        self.total = 0
+        self.bands = {band: 0 for _, band, _, _ in SCORE_BANDS}
+        self._pages = []  # temp file paths, in page order
+        self._out = None
+        self._on_page = 0
+
+    def page_path(self, page):
+        """Final path of a (1-based) report page"""
+        if page == 1:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return f"{root}_{page}{ext}"
+
+    def _start_page(self):
+        if self._out is not None:
+            self._out.close()
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        os.fchmod(fd, NEW_FILE_MODE)  # Not mkstemp's owner-only 0600
+        self._out = os.fdopen(fd, 'w', encoding='utf-8')
+        self._pages.append(temp_path)
+        self._on_page = 0
+        self._out.write(REPORT_PAGE_HEAD.substitute(date=self.generated.strftime('%B %d, %Y')))
+
+    def add(self, job):
+        """Write one job block"""
+        if self._out is None or self._on_page == self.per_page:
+            self._start_page()
+        
+        score = job['match_score']
+        _, band, score_class, score_text = next(b for b in SCORE_BANDS if score >= b[0])
+        self.bands[band] += 1
+        self.total += 1
+        self._on_page += 1
+        
+        # Merged jobs link to every source they were found on
+        links = job.get('sources') or [{'source': job['source'], 'url': job['url']}]
+        sources = "".join(f'<span class="source">{escape(link["source"])}</span>' for link in links)
+        other_links = "".join(
+            f' <a href="{escape(link["url"])}" class="apply-btn secondary" target="_blank">Also on {escape(link["source"])} →</a>'
+            for link in links[1:] if link['url']
+        )
+        
+        # Escape HTML characters in job data
+        self._out.write(REPORT_JOB_BLOCK.substitute(
+            title=escape(job['title']),
+            company=escape(job['company']),
+            location=escape(job['location']),
+            sources=sources,
+            other_links=other_links,
+            description=escape(job['description']),
+            url=escape(job['url']),
+            score_class=score_class,
+            score_text=score_text,
+            match_score=score,
+        ))
+
+    def _pager(self, page):
+        """Previous/next links for a page (empty for a single-page report)"""
+        count = len(self._pages)
+        if count == 1:
+            return ""
+        links = []
+        if page > 1:
+            links.append(f'<a href="{escape(os.path.basename(self.page_path(page - 1)))}">← Previous</a>')
+        links.append(f"<span>Page {page} of {count}</span>")
+        if page < count:
+            links.append(f'<a href="{escape(os.path.basename(self.page_path(page + 1)))}">Next →</a>')
+        return f'<div class="pager">{"".join(links)}</div>'
+
+    def close(self):
+        """Finish every page and move it into place; returns the page paths written"""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        
+        written = []
+        for page, temp_path in enumerate(self._pages, start=1):
+            with open(temp_path, 'a', encoding='utf-8') as out:
+                out.write(REPORT_PAGE_FOOT.substitute(
+                    total=self.total,
+                    pager=self._pager(page),
+                    generated=self.generated.strftime('%B %d, %Y at %I:%M %p'),
+                    **self.bands,
+                ))
+            os.replace(temp_path, self.page_path(page))
+            written.append(self.page_path(page))
+        
+        # Drop pages left over from a longer previous report
+        page = len(self._pages) + 1
+        while os.path.exists(self.page_path(page)):
+            os.remove(self.page_path(page))
+            page += 1
+        
+        self._pages = []
+        return written
+
+    def abort(self):
+        """Discard any partially written pages"""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        for temp_path in self._pages:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        self._pages = []
+
+def save_jobs_html(jobs, path=None):
+    """Save jobs (already sorted by match score) to a local HTML file for easy browsing"""
+    path = path or JOBS_HTML_FILE
+    writer = HtmlReportWriter(path, REPORT_JOBS_PER_PAGE)
     
     # Save to file
     try:
-        with open(JOBS_HTML_FILE, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"✅ Saved {len(jobs)} jobs to HTML file: {JOBS_HTML_FILE}")
-        
-        # Automatically open in Google Chrome
-        try:
-            subprocess.run(['open', '-a', 'Google Chrome', JOBS_HTML_FILE], check=False)
-            print(f"📂 Opening jobs in Google Chrome")
-        except Exception:
-            # Fallback to default open
-            try:
-                subprocess.run(['open', JOBS_HTML_FILE], check=False)
-                print(f"📂 Opening jobs in default browser")
-            except Exception:
-                print(f"📂 HTML file saved (couldn't auto-open)")
-            
+        for job in jobs:
+            writer.add(job)
+        pages = writer.close()
     except Exception as e:
+        writer.abort()
         print(f"❌ Error saving HTML file: {e}")
+        return
+    
+    if not pages:
+        print("No jobs to save to HTML.")
+        return
+    
+    extra = f" ({len(pages)} pages)" if len(pages) > 1 else ""
+    print(f"✅ Saved {writer.total} jobs to HTML file: {path}{extra}")
+    if OPEN_REPORT:
+        open_report(path)
+
+def open_report(path):
+    """Open the report in the browser without waiting for it"""
+    if shutil.which('open'):
+        # macOS: REPORT_BROWSER if installed, else the default browser
+        command = ['sh', '-c', 'open -a "$1" "$2" 2>/dev/null || open "$2"', 'sh', REPORT_BROWSER, path]
+    elif shutil.which('xdg-open'):
+        command = ['xdg-open', path]
+    else:
+        print(f"📂 HTML file saved (couldn't auto-open)")
+        return
+    try:
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        print(f"📂 Opening jobs in your browser")
+    except OSError:
+        print(f"📂 HTML file saved (couldn't auto-open)")
+
+# ============================================
+# JOB ARCHIVE
+# ============================================
+
+class JobArchive:
+    """Every parsed job, kept in SQLite with an FTS5 index over title, company, location and description.
+
+    Rows are upserted in batches of ARCHIVE_BATCH_SIZE per transaction;
+    triggers keep the external-content FTS table in step with the jobs
+    table, and only re-index a row when its text actually changed.
+    """
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                company TEXT NOT NULL,
+                location TEXT NOT NULL,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                description TEXT NOT NULL,
+                match_score INTEGER NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (first_seen);
+            CREATE INDEX IF NOT EXISTS jobs_match_score ON jobs (match_score);
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, company, location, description,
+                content='jobs', content_rowid='rowid', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts (rowid, title, company, location, description)
+                VALUES (new.rowid, new.title, new.company, new.location, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+                VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, location, description ON jobs
+            WHEN old.title IS NOT new.title OR old.company IS NOT new.company
+                OR old.location IS NOT new.location OR old.description IS NOT new.description
+            BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+                VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+                INSERT INTO jobs_fts (rowid, title, company, location, description)
+                VALUES (new.rowid, new.title, new.company, new.location, new.description);
+            END;
+        """)
+
+    def add_many(self, jobs):
+        """Insert or refresh jobs; a repeat sighting keeps the longer description, and the score that goes with it"""
+        now = time.time()
+        rows = [
+            (job['job_id'], job['title'], job['company'], job['location'], job['url'], job['source'],
+             job.get('description', ''), job['match_score'], now, now)
+            for job in jobs if job['job_id']
+        ]
+        for start in range(0, len(rows), ARCHIVE_BATCH_SIZE):
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("""
+                    INSERT INTO jobs (job_id, title, company, location, url, source, description,
+                                      match_score, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (job_id) DO UPDATE SET
+                        match_score = CASE WHEN length(excluded.description) >= length(description)
+                                           THEN excluded.match_score ELSE match_score END,
+                        last_seen = excluded.last_seen,
+                        description = CASE WHEN length(excluded.description) > length(description)
+                                           THEN excluded.description ELSE description END
+                """, rows[start:start + ARCHIVE_BATCH_SIZE])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    @staticmethod
+    def match_expression(text):
+        """FTS5 query for free text: every word must match, a trailing * matches prefixes"""
+        terms = []
+        for word in text.split():
+            prefix = word.endswith('*')
+            word = word.strip('*').replace('"', '')
+            if word:
+                terms.append(f'"{word}"' + ('*' if prefix else ''))
+        return ' '.join(terms)
+
+    def search(self, text='', days=None, min_score=None, source=None, limit=None):
+        """Archived jobs matching the filters, best score and newest first"""
+        sql = ("SELECT jobs.job_id, jobs.title, jobs.company, jobs.location, jobs.url, jobs.source, "
+               "jobs.description, jobs.match_score, jobs.first_seen FROM jobs")
+        conditions, params = [], []
+        expression = self.match_expression(text or '')
+        if expression:
+            sql += " JOIN jobs_fts ON jobs_fts.rowid = jobs.rowid"
+            conditions.append("jobs_fts MATCH ?")
+            params.append(expression)
+        if days is not None:
+            conditions.append("jobs.first_seen >= ?")
+            params.append(time.time() - days * 86400)
+        if min_score is not None:
+            conditions.append("jobs.match_score >= ?")
+            params.append(min_score)
+        if source:
+            conditions.append("jobs.source = ? COLLATE NOCASE")
+            params.append(source)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY jobs.match_score DESC, jobs.first_seen DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        columns = ('job_id', 'title', 'company', 'location', 'url', 'source', 'description', 'match_score', 'first_seen')
+        return [dict(zip(columns, row)) for row in self._conn.execute(sql, params)]
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+def archive_jobs(jobs):
+    """Add scored jobs, with their full descriptions, to the archive"""
+    if not ARCHIVE_JOBS or not jobs:
+        return
+    with METRICS.stage('archive'):
+        try:
+            archive = JobArchive(JOB_ARCHIVE_DB)
+            try:
+                archive.add_many(jobs)
+            finally:
+                archive.close()
+        except Exception as e:
+            print(f"⚠️  Could not archive jobs: {e}")
+
+def search_archive(text='', days=None, min_score=None, source=None, limit=None, report_path=None):
+    """Query the archive from the command line; print the matches or rebuild a report from them"""
+    archive = JobArchive(JOB_ARCHIVE_DB)
+    start = time.perf_counter()
+    results = archive.search(text, days, min_score, source, limit)
+    elapsed = time.perf_counter() - start
+    print(f"🔎 {len(results)} archived jobs match ({elapsed * 1000:.1f} ms, {len(archive)} archived)")
+    archive.close()
+    
+    if report_path:
+        # Same merging as a live run, so a job on both sites is one entry with two links
+        index = DuplicateIndex(FUZZY_DEDUP, FUZZY_DEDUP_THRESHOLD)
+        for row in results:
+            job = Job.from_dict(row)
+            job['description'] = job['description'][:300]
+            fingerprint, block, title_key = dedup_keys(job)
+            index.add(job, fingerprint, block, title_signature(title_key) if FUZZY_DEDUP else None)
+        jobs = sorted(index.records.values(), key=lambda x: x['match_score'], reverse=True)
+        if jobs:
+            save_jobs_html(jobs, report_path)
+        return
+    
+    for job in results:
+        found = datetime.fromtimestamp(job['first_seen']).strftime('%Y-%m-%d')
+        print(f"  {job['match_score']:3d}%  {job['title']} - {job['company']} ({job['location']}) "
+              f"[{job['source']}, {found}]")
+        print(f"        {job['url']}")
+
+# ============================================
+# STREAMING PIPELINE
+# ============================================
+
+# A run is a chain of generators over (key, jobs) chunks, one chunk per
+# (title, source) query: fetch → parse (stream_queries) → enrich → score
+# → archive → dedup. Each stage handles a query's jobs as soon as it
+# finishes, while later queries are still fetching, and drops them once
+# passed on; only the new jobs' merged records are kept until the report.
+# Stage timings add up over chunks; 'fetch' is time spent waiting for them.
+
+def timed_chunks(chunks, stage):
+    """Pass chunks through, timing the wait for each one as `stage`"""
+    chunks = iter(chunks)
+    while True:
+        with METRICS.stage(stage):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+def enrich_stage(chunks, seen_store):
+    """Enrich each chunk's LinkedIn jobs, ENRICH_MAX_JOBS fetches in all, best title scores first within a chunk"""
+    totals = {'candidates': 0, 'enriched': 0, 'cached': 0, 'fetched': 0, 'tried': 0}
+    for key, jobs in chunks:
+        with METRICS.stage('enrich'):
+            try:
+                counts = enrich_linkedin_jobs(jobs, seen_store, ENRICH_MAX_JOBS - totals['tried'])
+                for name, value in counts.items():
+                    totals[name] += value
+            except Exception as e:
+                print(f"⚠️  LinkedIn enrichment failed: {e}")
+        yield key, jobs
+    print_enrichment(totals)
+
+def score_stage(chunks):
+    """Score each chunk (against fixed term statistics, so chunk order doesn't change a score)"""
+    for key, jobs in chunks:
+        with METRICS.stage('score'):
+            score_jobs(jobs)
+        yield key, jobs
+
+def archive_stage(chunks):
+    """Archive each chunk with full descriptions, then trim them for display"""
+    for key, jobs in chunks:
+        archive_jobs(jobs)
+        for job in jobs:
+            job['description'] = job['description'][:300]
+        yield key, jobs
+
+def dedup_stage(chunks, deduper):
+    """Feed each chunk to a RunDeduper; yields (key, jobs, records the chunk started)"""
+    for key, jobs in chunks:
+        with METRICS.stage('dedup'):
+            started = deduper.add(jobs)
+        yield key, jobs, started
+
+def job_pipeline(chunks, seen_store, deduper):
+    """Chain the stages over (key, jobs) chunks from stream_queries()"""
+    chunks = timed_chunks(chunks, 'fetch')
+    if ENRICH_LINKEDIN:
+        chunks = enrich_stage(chunks, seen_store)
+    chunks = archive_stage(score_stage(chunks))
+    return dedup_stage(chunks, deduper)
+
+class RunDeduper:
+    """Merges a run's postings chunk by chunk and sorts out which are new.
+
+    add() drops postings already in seen_store (by ID, or as a repost of
+    a reported job) and merges the rest across chunks through one
+    DuplicateIndex, so a job found by several queries or on several
+    sources is one record. seen_store is only written in finish(): the
+    crawls still running consult it to stop paging, and this run's own
+    jobs mustn't look like old news to them.
+    """
+
+    def __init__(self, seen_store):
+        self.seen_store = seen_store
+        self.index = DuplicateIndex(FUZZY_DEDUP, FUZZY_DEDUP_THRESHOLD)
+        self.known_ids = set()
+        self.known_fingerprints = set()
+        self.reposted_ids = set()
+        self.merged = 0
+
+    def add(self, jobs):
+        """Dedup a chunk of postings; returns the records it started"""
+        started = []
+        for job in jobs:
+            job_id = job['job_id']
+            if not job_id:
+                continue
+            fingerprint, block, title_key = dedup_keys(job)
+            if job_id in self.seen_store:
+                self.known_ids.add(job_id)
+                self.known_fingerprints.add(fingerprint)
+                continue
+            signature = title_signature(title_key) if FUZZY_DEDUP else None
+            match = self.seen_store.find_duplicate(fingerprint, block, signature)
+            if match is not None:
+                # Reported before under another ID or source
+                self.reposted_ids.add(job_id)
+                self.known_fingerprints.add(match)
+                continue
+            if self.index.add(job, fingerprint, block, signature):
+                started.append(self.index.records[fingerprint])
+            else:
+                self.merged += 1
+        return started
+
+    def finish(self):
+        """Record the new jobs in seen_store and return them"""
+        # Record new jobs before reporting them; jobs an overlapping run already
+        # claimed are dropped so they aren't reported twice
+        records = list(self.index.records.values())
+        claimed = self.seen_store.claim(
+            {link['job_id'] for record in records for link in record['sources']} | self.reposted_ids)
+        new_jobs = [record for record in records if any(link['job_id'] in claimed for link in record['sources'])]
+        self.seen_store.remember({job['fingerprint']: self.index.keys[job['fingerprint']] for job in new_jobs})
+        self.seen_store.touch(self.known_ids, self.known_fingerprints)
+        if self.merged or self.reposted_ids:
+            print(f"🔗 Merged {self.merged} duplicate postings, skipped {len(self.reposted_ids)} reposts of reported jobs")
+        return new_jobs
+
+def dedup_jobs(all_jobs, seen_store):
+    """Merge postings of the same job, drop already-reported jobs, and record the new ones in seen_store"""
+    deduper = RunDeduper(seen_store)
+    deduper.add(all_jobs)
+    return deduper.finish()
 
 # ============================================
 # MAIN FUNCTION
 # ============================================
 
-def main():
-    """Main function to search jobs and send email"""
+def main(resume=False, work_queue=None):
+    """Main function to search jobs and send email.
+
+    resume: reuse the last run's fresh checkpoints; work_queue: have
+    --worker processes fetch the pages (see coordinate_queries)
+    """
     print(f"\n{'='*60}")
     print(f"Job Search Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*60}\n")
     
-    all_jobs = []
-    sent_jobs = load_sent_jobs()
+    METRICS.reset()
+    seen_store = open_seen_store()
+    # Fork the parse workers before the outbox thread starts (workers parse for the coordinator)
+    started_pool = PARSE_POOL.start() if work_queue is None else False
+    NOTIFY_OUTBOX.start()  # Notifications left over from earlier runs go out while we search
     
-    # Search each job title on both platforms
-    for job_title in JOB_TITLES:
-        print(f"Searching for: {job_title}")
-        
-        # Search Indeed
-        indeed_jobs = search_indeed(job_title)
-        print(f"  - Found {len(indeed_jobs)} jobs on Indeed")
-        all_jobs.extend(indeed_jobs)
-        
-        # Search LinkedIn
-        linkedin_jobs = search_linkedin(job_title)
-        print(f"  - Found {len(linkedin_jobs)} jobs on LinkedIn")
-        all_jobs.extend(linkedin_jobs)
-        
-        time.sleep(3)  # Pause between searches
+    # Plan the searches: overlapping titles are merged or skipped
+    planner = QueryPlanner(QUERY_STATS_FILE) if QUERY_PLANNER else None
+    if planner:
+        plan = planner.plan(JOB_TITLES)
+        planner.print_plan(plan, JOB_TITLES)
+    else:
+        plan = [(job_title, source, [job_title]) for job_title in JOB_TITLES for source in SOURCES]
     
-    # Filter out already-sent jobs and duplicates
-    new_jobs = []
-    seen_ids = set()
+    # Checkpoint every finished search; when resuming, skip those already fetched
+    journal = RunJournal(RUN_JOURNAL_FILE)
+    done = journal.open(resume)
+    queries = [(query, source) for query, source, _ in plan]
+    pending = [key for key in queries if key not in done]
+    if resume:
+        print(f"⏩ Resuming: {len(queries) - len(pending)} of {len(queries)} searches already fetched")
     
-    for job in all_jobs:
-        job_id = job['job_id']
-        if job_id and job_id not in sent_jobs and job_id not in seen_ids:
-            new_jobs.append(job)
-            seen_ids.add(job_id)
+    # Run the planned searches on both platforms concurrently; checkpointed results go first
+    if work_queue is not None:
+        fetched = coordinate_queries(work_queue, pending, seen_store, journal)
+    else:
+        fetched = stream_queries(pending, seen_store, journal)
+    chunks = itertools.chain(((key, done[key][0]) for key in queries if key in done), fetched)
+    _, found_ids = report_new_jobs(chunks, seen_store)
+    if started_pool:
+        PARSE_POOL.close()
+    RELEVANCE_SCORER.save_stats()  # This run's postings weigh in from the next run on
+    
+    # A blocked source returns nothing, which would read as no overlap
+    if planner and not CIRCUIT_BREAKER.open_hosts():
+        page_counts = {key: pages for key, (_, pages) in done.items()}
+        page_counts.update({key: record['pages'] for key, record in METRICS.queries.items()})
+        # Only searches that came back cleanly say anything about overlap (checkpoints are always clean)
+        complete = {key for key, pages in page_counts.items()
+                    if pages and (key in done or METRICS.queries[key].get('complete'))}
+        saved = planner.record(plan, found_ids, page_counts, complete)
+        METRICS.count('requests_saved', round(saved))
+        if saved > 0:
+            print(f"🧭 Query planner saved ~{saved:.0f} requests this run")
+        planner.save()
+    
+    seen_store.close()
+    journal.finish()
+    NOTIFY_OUTBOX.close()
+    
+    print()
+    METRICS.print_summary()
+    METRICS.write(METRICS_DIR, HTTP_CLIENT.stats(), HTTP_CACHE.stats)
+    
+    print(f"\nJob search completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+def open_seen_store():
+    """The seen-jobs store, with fuzzy matching if enabled"""
+    return SeenStore(SEEN_JOBS_DB, SEEN_JOBS_TTL_DAYS, FUZZY_DEDUP_THRESHOLD if FUZZY_DEDUP else None)
+
+def report_new_jobs(chunks, seen_store):
+    """Run (key, jobs) chunks through the streaming pipeline, then notify and report.
+
+    Returns the new jobs and, per (title, source) query, the set of job
+    IDs it found.
+    """
+    deduper = RunDeduper(seen_store)
+    found_ids = {}
+    found = 0
+    for (job_title, source), jobs, _ in job_pipeline(chunks, seen_store, deduper):
+        # Printed as each query clears the pipeline, while the rest are still fetching
+        print(f"Searching {source} for: {job_title}")
+        print(f"  - Found {len(jobs)} jobs")
+        found_ids[(job_title, source)] = {job['job_id'] for job in jobs}
+        found += len(jobs)
+    
+    # Filter out already-sent jobs and duplicates
+    with METRICS.stage('dedup'):
+        new_jobs = deduper.finish()
+    METRICS.count('jobs_found', found)
+    METRICS.count('new_jobs', len(new_jobs))
     
     print(f"\n{'='*60}")
     print(f"Total new jobs found: {len(new_jobs)}")
     print(f"{'='*60}\n")
     
-    # Notify and save if there are new jobs
+    HTTP_CACHE.save()
+    print_http_stats()
+    deliver_new_jobs(new_jobs)
+    return new_jobs, found_ids
+
+def print_http_stats():
+    """Log connection, retry and cache counters"""
+    print("HTTP stats:")
+    HTTP_CLIENT.print_stats()
+    HTTP_CACHE.print_stats()
+    print()
+
+def deliver_new_jobs(new_jobs, report_path=None, label=None):
+    """Write new jobs to the HTML report and queue notifications about them"""
     if new_jobs:
-        # Send desktop notification
-        send_desktop_notification(new_jobs)
+        # Best matches first, for both the notification and the report
+        new_jobs.sort(key=lambda x: x['match_score'], reverse=True)
         
         # Save to HTML file for viewing
-        save_jobs_html(new_jobs)
+        with METRICS.stage('report'):
+            save_jobs_html(new_jobs, report_path)
         
-        # Update sent jobs list
-        sent_jobs.extend(list(seen_ids))
-        # Keep only last 1000 job IDs to prevent file from growing too large
-        if len(sent_jobs) > 1000:
-            sent_jobs = sent_jobs[-1000:]
-        save_sent_jobs(sent_jobs)
+        # Delivered by the outbox's background thread
+        with METRICS.stage('notify'):
+            NOTIFY_OUTBOX.enqueue(new_jobs, report_path or JOBS_HTML_FILE, label)
     else:
         print("No new jobs to report.")
+
+# ============================================
+# DAEMON MODE
+# ============================================
+
+class QuerySchedule:
+    """Per-(title, source) polling intervals that adapt to each query's new-job yield.
+
+    A poll that found new jobs multiplies the query's interval by
+    DAEMON_SPEEDUP, a quiet one by DAEMON_BACKOFF, within the
+    DAEMON_MIN/MAX_INTERVAL_MINUTES bounds. Intervals and due times are
+    saved to a JSON file so a restarted daemon picks up where it left off.
+    """
+
+    def __init__(self, path, queries):
+        self.path = path
+        saved = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Could not load {path}: {e}")
+        self.entries = {}
+        for job_title, source in queries:
+            entry = saved.get(f"{source}:{job_title}") or {
+                'interval': DAEMON_START_INTERVAL_MINUTES * 60, 'next_due': 0, 'new_jobs': 0,
+            }
+            self.entries[(job_title, source)] = entry
+
+    def due(self, now):
+        """Queries whose next poll is due"""
+        return [query for query, entry in self.entries.items() if entry['next_due'] <= now]
+
+    def next_due(self):
+        """Time of the earliest upcoming poll"""
+        return min(entry['next_due'] for entry in self.entries.values())
+
+    def record(self, query, new_jobs, now):
+        """Adapt a query's interval to the new jobs its last poll found and schedule the next poll"""
+        entry = self.entries[query]
+        factor = DAEMON_SPEEDUP if new_jobs else DAEMON_BACKOFF
+        entry['interval'] = min(max(entry['interval'] * factor, DAEMON_MIN_INTERVAL_MINUTES * 60),
+                                DAEMON_MAX_INTERVAL_MINUTES * 60)
+        # A little jitter keeps queries that share an interval from bunching up
+        entry['next_due'] = now + entry['interval'] * random.uniform(0.9, 1.1)
+        entry['new_jobs'] = new_jobs
+
+    def save(self):
+        """Write intervals and due times"""
+        data = {f"{source}:{job_title}": entry for (job_title, source), entry in self.entries.items()}
+        with atomic_write(self.path) as f:
+            json.dump(data, f, indent=2)
+
+def _request_shutdown(signum, frame):
+    """SIGTERM/SIGINT handler: finish the current page, then flush state and exit"""
+    print(f"\n🛑 Received signal {signum}, stopping after the current page...")
+    SHUTDOWN.set()
+
+def run_poll(queries, seen_store, schedule):
+    """Poll the due queries once and reschedule them by how many new jobs each found"""
+    METRICS.reset()
+    print(f"\n{'='*60}")
+    print(f"Polling {len(queries)} queries: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"{'='*60}\n")
     
-    print(f"\nJob search completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    new_jobs, found_ids = report_new_jobs(stream_queries(queries, seen_store), seen_store)
+    RELEVANCE_SCORER.save_stats()
+    
+    # Credit each new job to every query that returned one of its postings
+    new_ids = {link['job_id'] for job in new_jobs for link in job['sources']}
+    now = time.time()
+    for job_title, source in queries:
+        found = len(found_ids.get((job_title, source), set()) & new_ids)
+        schedule.record((job_title, source), found, now)
+        interval = schedule.entries[(job_title, source)]['interval'] / 60
+        print(f"  - {source} / {job_title}: {found} new, next poll in {interval:.0f} min")
+    schedule.save()
+    
+    print()
+    METRICS.print_summary()
+    METRICS.write(METRICS_DIR, HTTP_CLIENT.stats(), HTTP_CACHE.stats)
+
+def run_daemon():
+    """Stay resident and poll each (title, source) query on its own adaptive schedule.
+
+    HTTP sessions, the seen-jobs store, caches and parse workers stay warm
+    between polls. SIGTERM or SIGINT stops the daemon at the next page
+    boundary and flushes the schedule, HTTP cache and seen-jobs store.
+    """
+    queries = [(job_title, source) for job_title in JOB_TITLES for source in SOURCES]
+    schedule = QuerySchedule(DAEMON_STATE_FILE, queries)
+    seen_store = open_seen_store()
+    # The schedule decides when a query is due, so every poll revalidates its pages: a
+    # DAEMON_MIN_INTERVAL_MINUTES poll inside the cache TTL would otherwise see the last poll's pages
+    HTTP_CACHE.ttl_seconds = 0
+    PARSE_POOL.start()  # Before installing handlers, so workers keep the default SIGTERM behaviour
+    NOTIFY_OUTBOX.start()
+    signal.signal(signal.SIGTERM, _request_shutdown)
+    signal.signal(signal.SIGINT, _request_shutdown)
+    print(f"👀 Job search daemon started (pid {os.getpid()}), {len(queries)} queries")
+    
+    try:
+        while not SHUTDOWN.is_set():
+            due = schedule.due(time.time())
+            if due:
+                seen_store.evict_expired()  # Once per poll: the daemon may run for longer than the TTL
+                run_poll(due, seen_store, schedule)
+            else:
+                SHUTDOWN.wait(max(1.0, schedule.next_due() - time.time()))
+    finally:
+        schedule.save()
+        HTTP_CACHE.save()
+        seen_store.close()
+        PARSE_POOL.close()
+        NOTIFY_OUTBOX.close()
+        print(f"✅ Daemon stopped, state saved to {DAEMON_STATE_FILE}")
+
+# ============================================
+# WORK QUEUE MODE
+# ============================================
+
+class WorkQueue:
+    """Results pages shared out to worker processes through a SQLite table.
+
+    The coordinator queues one task per page, (title, source, location,
+    page); any number of workers, on this machine or on others that see
+    the same file, claim tasks, fetch and parse the page, and write its
+    jobs back. A claim is a lease: the task stays hidden for
+    lease_seconds and becomes claimable again if its worker dies or
+    stalls (a visibility timeout). A failed page is retried up to
+    WORK_MAX_ATTEMPTS times, then handed back as failed. Uses SQLite's
+    rollback journal rather than WAL, since WAL doesn't work across
+    machines.
+    """
+
+    def __init__(self, path, lease_seconds=WORK_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT NOT NULL,
+                location TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                visible_at REAL NOT NULL,
+                owner TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                status INTEGER,
+                cards INTEGER,
+                dropped INTEGER,
+                bytes INTEGER,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        # visible_at: when a queued task may be claimed, or when a leased task's lease runs out
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_visible ON tasks (state, visible_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id, state)")
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, run_id, tasks):
+        """Queue (title, source, location, page) tasks for a run"""
+        now = time.time()
+        with self._transaction():
+            # Left behind by coordinators that died without cleaning up
+            self._conn.execute("DELETE FROM tasks WHERE created < ?", (now - 86400,))
+            self._conn.executemany(
+                "INSERT INTO tasks (run_id, title, source, location, page, state, visible_at, created) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                [(run_id, job_title, source, location, page, now, now) for job_title, source, location, page in tasks],
+            )
+
+    def claim(self, owner):
+        """Lease the next claimable task to owner; returns it as a dict, or None if there's nothing to do"""
+        now = time.time()
+        with self._transaction():
+            # A lease that ran out on the last attempt isn't handed out again
+            self._conn.execute(
+                "UPDATE tasks SET state = 'failed', error = 'lease expired' "
+                "WHERE state = 'leased' AND visible_at <= ? AND attempts >= ?",
+                (now, WORK_MAX_ATTEMPTS),
+            )
+            # Later pages first, so queries finish (and reach the pipeline) sooner
+            row = self._conn.execute(
+                "SELECT id, run_id, title, source, location, page FROM tasks "
+                "WHERE state IN ('queued', 'leased') AND visible_at <= ? ORDER BY page DESC, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE tasks SET state = 'leased', owner = ?, visible_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (owner, now + self.lease_seconds, row[0]),
+            )
+        return dict(zip(('id', 'run_id', 'title', 'source', 'location', 'page'), row))
+
+    def complete(self, task_id, owner, jobs, status, cards=0, dropped=0, size=0):
+        """Hand back a fetched page; False if the lease ran out and the task went to another worker"""
+        result = json.dumps([job.to_dict() for job in jobs])
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE tasks SET state = 'done', status = ?, cards = ?, dropped = ?, bytes = ?, result = ? "
+                "WHERE id = ? AND owner = ? AND state = 'leased'",
+                (status, cards, dropped, size, result, task_id, owner),
+            )
+        return cursor.rowcount == 1
+
+    def retry(self, task_id, owner, error, delay=WORK_RETRY_SECONDS, counted=True):
+        """Put a page the worker couldn't fetch back on the queue (failed for good after WORK_MAX_ATTEMPTS).
+
+        counted=False gives the attempt back, for pages the worker didn't try at all.
+        """
+        refund = 0 if counted else 1
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE tasks SET attempts = attempts - ?, "
+                "state = CASE WHEN attempts - ? >= ? THEN 'failed' ELSE 'queued' END, visible_at = ?, error = ? "
+                "WHERE id = ? AND owner = ? AND state = 'leased'",
+                (refund, refund, WORK_MAX_ATTEMPTS, time.time() + delay, error, task_id, owner),
+            )
+
+    def collect(self, run_id):
+        """Remove and return a run's finished (done or failed) tasks, with their jobs as Job records"""
+        columns = ('id', 'title', 'source', 'page', 'state', 'status', 'cards', 'dropped', 'bytes', 'result', 'error')
+        with self._transaction():
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM tasks WHERE run_id = ? AND state IN ('done', 'failed')",
+                (run_id,),
+            ).fetchall()
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", [(row[0],) for row in rows])
+        tasks = []
+        for row in rows:
+            task = dict(zip(columns, row))
+            task['jobs'] = [Job.from_dict(job) for job in json.loads(task.pop('result') or '[]')]
+            tasks.append(task)
+        return tasks
+
+    def purge(self, run_id):
+        """Drop whatever is left of a run, so workers don't fetch pages nobody will collect"""
+        with self._transaction():
+            self._conn.execute("DELETE FROM tasks WHERE run_id = ?", (run_id,))
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+def coordinate_queries(queue, queries, seen_store=None, journal=None):
+    """stream_queries() for work-queue mode: workers fetch the pages, this process decides what to fetch.
+
+    Page 0 of every query is queued at once. Each page that comes back
+    queues the next, unless it was empty, the page budget is spent or the
+    page was mostly known jobs (the crawl_pages() rules, checked against
+    this process's seen_store). Yields (key, jobs) as each query's last
+    page comes back; queries still waiting after WORK_STALL_MINUTES with
+    no progress are yielded with what they have. Pages are collected on a
+    background thread, so the workers get their next pages (and finished
+    queries are checkpointed) while the consumer is busy, e.g. enriching.
+    """
+    finished = SimpleQueue()
+    stop = threading.Event()
+    thread = threading.Thread(target=_coordinate, args=(queue, queries, seen_store, journal, finished, stop),
+                              name="coordinator", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = finished.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+def _coordinate(queue, queries, seen_store, journal, finished, stop):
+    """coordinate_queries()'s collection loop; puts (key, jobs), an exception or None (done) on finished"""
+    run_id = f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+    started = time.time()
+    progress = {
+        key: {'jobs': [], 'outstanding': 1, 'pages': 0, 'bytes': 0, 'statuses': {},
+              'cards_parsed': 0, 'cards_dropped': 0, 'errors': 0}
+        for key in queries
+    }
+    try:
+        queue.enqueue(run_id, [(job_title, source, LOCATION, 0) for job_title, source in progress])
+        if progress:
+            print(f"📋 Queued {len(progress)} searches on {queue.path}, waiting for workers")
+        last_page = time.time()
+        while progress and not stop.is_set():
+            tasks = queue.collect(run_id)
+            if not tasks:
+                if time.time() - last_page > WORK_STALL_MINUTES * 60:
+                    print(f"⚠️  No page came back in {WORK_STALL_MINUTES} minutes, "
+                          f"giving up on {len(progress)} searches (are any workers running?)")
+                    for key in list(progress):
+                        finished.put((key, _finish_remote_query(key, progress.pop(key), started, journal)))
+                    return
+                stop.wait(WORK_POLL_SECONDS)
+                continue
+            last_page = time.time()
+            
+            for task in tasks:
+                key = (task['title'], task['source'])
+                state = progress[key]
+                state['outstanding'] -= 1
+                if task['state'] == 'failed':
+                    state['errors'] += 1
+                    print(f"Error searching {key[1]} for {key[0]} (page {task['page'] + 1}): {task['error']}")
+                else:
+                    page_jobs = task['jobs']
+                    state['jobs'].extend(page_jobs)
+                    state['pages'] += 1
+                    state['bytes'] += task['bytes'] or 0
+                    state['statuses'][str(task['status'])] = state['statuses'].get(str(task['status']), 0) + 1
+                    state['cards_parsed'] += task['cards'] or 0
+                    state['cards_dropped'] += task['dropped'] or 0
+                    next_page = task['page'] + 1
+                    if page_jobs and next_page < MAX_PAGES_PER_QUERY and not page_is_stale(page_jobs, seen_store):
+                        queue.enqueue(run_id, [(key[0], key[1], LOCATION, next_page)])
+                        state['outstanding'] += 1
+                if not state['outstanding']:
+                    finished.put((key, _finish_remote_query(key, progress.pop(key), started, journal)))
+    except BaseException as e:
+        finished.put(e)
+    finally:
+        queue.purge(run_id)
+        share_rate_limit(1)  # Workers have nothing left to fetch: the rest of the run gets the full rate
+        finished.put(None)
+
+def _finish_remote_query(key, state, started, journal):
+    """Record a query's metrics and checkpoint it if every page came back cleanly; returns its jobs"""
+    jobs = state.pop('jobs')
+    complete = not state.pop('outstanding') and not state['errors'] and all(
+        int(status) < 500 for status in state['statuses'])
+    METRICS.remote_query(*key, wall_seconds=time.time() - started, jobs=len(jobs), complete=complete, **state)
+    if journal is not None and complete:
+        journal.record(key, jobs, state['pages'])
+    return jobs
+
+def run_task(queue, owner, task):
+    """Fetch and parse one page task and hand its jobs back to the queue"""
+    job_title, source, page = task['title'], task['source'], task['page']
+    url = SEARCH_URLS[source](job_title, page, task['location'])
+    try:
+        with METRICS.query(job_title, source) as record:
+            jobs = fetch_page_jobs(url, source)
+    except CircuitOpenError as e:
+        # Blocked from this machine: leave the page to a worker elsewhere, or to this one after the cooldown
+        queue.retry(task['id'], owner, str(e), counted=False)
+        return
+    except Exception as e:
+        print(f"Error fetching {source} / {job_title} page {page + 1}: {e}")
+        queue.retry(task['id'], owner, str(e))
+        return
+    
+    status = int(next(iter(record['statuses']), 0))
+    if queue.complete(task['id'], owner, jobs, status, record['cards_parsed'], record['cards_dropped'], record['bytes']):
+        print(f"  - {source} / {job_title} page {page + 1}: {len(jobs)} jobs")
+    else:
+        print(f"⚠️  Lease on {source} / {job_title} page {page + 1} ran out; another worker has it")
+
+def share_rate_limit(processes):
+    """Set RATE_LIMITER to this process's share of the per-host rate, for `processes` on one IP (1 restores it)"""
+    RATE_LIMITER.min_interval = HOST_MIN_INTERVAL * processes
+    RATE_LIMITER.burst = HOST_BURST if processes == 1 else 1  # Bursts from every process at once would add up
+
+def run_worker(path, rate_share=1):
+    """Claim page tasks from the work queue at path and fetch them until SIGTERM or SIGINT.
+
+    rate_share splits the per-host request rate between that many
+    processes on this IP: this one sends at most 1/rate_share of it.
+    """
+    share_rate_limit(rate_share)
+    queue = WorkQueue(path)
+    owner = f"{socket.gethostname()}-{os.getpid()}"
+    signal.signal(signal.SIGTERM, _request_shutdown)
+    signal.signal(signal.SIGINT, _request_shutdown)
+    print(f"👷 Worker {owner} taking pages from {path}")
+    
+    pages = 0
+    try:
+        while not SHUTDOWN.is_set():
+            task = queue.claim(owner)
+            if task is None:
+                SHUTDOWN.wait(WORK_POLL_SECONDS)
+                continue
+            run_task(queue, owner, task)
+            pages += 1
+            METRICS.reset()  # Per-page counters were handed back with the task
+    finally:
+        HTTP_CACHE.save()
+        queue.close()
+        print(f"✅ Worker {owner} stopped after {pages} pages")
+
+def run_coordinator(path, local_workers=0, resume=False):
+    """main(), with every results page fetched by workers through the work queue at path.
+
+    local_workers starts that many worker processes on this machine and
+    stops them when the run is done. They share the HTTP cache and the
+    circuit breaker state, and split the per-host request rate with this
+    process (which fetches the LinkedIn descriptions) until the last page
+    is in.
+    """
+    queue = WorkQueue(path)
+    rate_share = local_workers + 1
+    share_rate_limit(rate_share)
+    workers = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), '--worker', '--queue', path,
+                          '--rate-share', str(rate_share)])
+        for _ in range(local_workers)
+    ]
+    try:
+        main(resume, queue)
+    finally:
+        for worker in workers:
+            worker.terminate()  # SIGTERM: finish the current page, then exit
+        for worker in workers:
+            worker.wait()
+        queue.close()
+
+# ============================================
+# MULTI-PROFILE MODE
+# ============================================
+
+class SearchProfile:
+    """One person's (or one search's) titles, skills, seen-jobs store and report, loaded from JSON.
+
+    Lists left out of the file fall back to the settings at the top of this script.
+    """
+
+    def __init__(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.name = config.get('name') or os.path.splitext(os.path.basename(path))[0]
+        self.slug = re.sub(r'[^a-z0-9]+', '_', self.name.lower()).strip('_') or 'profile'
+        self.job_titles = config.get('job_titles', JOB_TITLES)
+        self.required_skills = config.get('required_skills', REQUIRED_SKILLS)
+        self.nice_to_have = config.get('nice_to_have', NICE_TO_HAVE)
+        self.leadership_keywords = config.get('leadership_keywords', LEADERSHIP_KEYWORDS)
+        resume_file = config.get('resume_file')
+        if resume_file:
+            resume_file = os.path.join(os.path.dirname(os.path.abspath(path)), os.path.expanduser(resume_file))
+        self.resume_text = load_resume_text(resume_file)
+        self.min_score = config.get('min_score', 0)
+        self.seen_db = config.get('seen_db', f"seen_jobs_{self.slug}.db")
+        self.report_file = config.get('report_file') or os.path.join(
+            os.path.dirname(__file__), f"latest_jobs_{self.slug}.html")
+        if not self.job_titles:
+            raise ValueError("no job_titles")
+
+    def open_seen_store(self):
+        """This profile's own seen-jobs store"""
+        return SeenStore(self.seen_db, SEEN_JOBS_TTL_DAYS, FUZZY_DEDUP_THRESHOLD if FUZZY_DEDUP else None)
+
+def load_profiles(path):
+    """Profiles from a directory of *.json files, or from a single file"""
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json')]
+    else:
+        paths = [path]
+    profiles = []
+    slugs = set()
+    for profile_path in paths:
+        try:
+            profile = SearchProfile(profile_path)
+        except Exception as e:
+            print(f"❌ Skipping profile {profile_path}: {e}")
+            continue
+        if profile.slug in slugs:
+            print(f"❌ Skipping profile {profile_path}: another profile is already named {profile.name!r}")
+            continue
+        slugs.add(profile.slug)
+        profiles.append(profile)
+    return profiles
+
+class ProfileMatcher(RelevanceScorer):
+    """Scores one batch of jobs against several profiles at once.
+
+    The term matrix is built once over the union of all profiles' terms;
+    an inverted index from term to (profile, points) then routes each
+    matching entry to the profiles that care about it, so a job only
+    costs work for the profiles it actually matches.
+    """
+
+    def __init__(self, profiles):
+        index = {}
+        stems = set()
+        for p, profile in enumerate(profiles):
+            weights, profile_stems = profile_weights(profile.required_skills, profile.nice_to_have,
+                                                     profile.leadership_keywords, profile.resume_text)
+            stems |= profile_stems
+            for term, points in weights.items():
+                index.setdefault(term, []).append((p, points))
+        self._build_vocabulary(list(index), stems)
+        self.index = [index[term] for term in self.terms]
+        self.profile_count = len(profiles)
+
+    def match(self, jobs):
+        """Per profile, {row in jobs: calibrated 0-100 score} for the jobs matching any of its terms"""
+        raw = [{} for _ in range(self.profile_count)]
+        if not jobs:
+            return raw
+        rows, cols, values = self.term_matrix(jobs, learn=True)
+        if np is not None:
+            rows, cols, values = rows.tolist(), cols.tolist(), values.tolist()
+        for row, col, value in zip(rows, cols, values):
+            for p, points in self.index[col]:
+                raw[p][row] = raw[p].get(row, 0.0) + value * points
+        matches = []
+        for profile_raw in raw:
+            matched_rows = list(profile_raw)
+            matches.append(dict(zip(matched_rows, self._calibrate([profile_raw[row] for row in matched_rows]))))
+        return matches
+
+class AllProfilesSeen:
+    """Read-only view over several seen-jobs stores: a job counts as seen once every profile has seen it.
+
+    Used while fetching and enriching, so shared searches stop paging and
+    skip description fetches only for jobs no profile still needs.
+    """
+
+    def __init__(self, stores):
+        self.stores = stores
+
+    def __contains__(self, job_id):
+        return all(job_id in store for store in self.stores)
+
+    def find_duplicate(self, fingerprint, block, signature=None):
+        match = None
+        for store in self.stores:
+            match = store.find_duplicate(fingerprint, block, signature)
+            if match is None:
+                return None
+        return match
+
+def run_profiles(profiles):
+    """Fetch the union of all profiles' searches once, then score, dedup and report per profile"""
+    print(f"\n{'='*60}")
+    print(f"Multi-profile Job Search Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"{'='*60}\n")
+    
+    if not profiles:
+        print("❌ No profiles to search for")
+        return
+    
+    METRICS.reset()
+    # Each (title, source) search runs once, however many profiles want it
+    wanted = {}
+    for p, profile in enumerate(profiles):
+        for job_title in profile.job_titles:
+            for source in SOURCES:
+                wanted.setdefault((job_title, source), set()).add(p)
+    requested = sum(len(profile.job_titles) for profile in profiles) * len(SOURCES)
+    print(f"👥 {len(profiles)} profiles: {len(wanted)} unique searches instead of {requested}")
+    
+    stores = [profile.open_seen_store() for profile in profiles]
+    all_seen = AllProfilesSeen(stores)
+    started_pool = PARSE_POOL.start()  # Fork the parse workers before the outbox thread starts
+    NOTIFY_OUTBOX.start()
+    with METRICS.stage('fetch'):
+        results = search_queries(list(wanted), all_seen)
+    if started_pool:
+        PARSE_POOL.close()
+    for (job_title, source), jobs in results.items():
+        print(f"Searching {source} for: {job_title}")
+        print(f"  - Found {len(jobs)} jobs")
+    
+    all_jobs = []
+    wanted_by = []  # Profiles whose own searches found each job
+    for key, jobs in results.items():
+        all_jobs.extend(jobs)
+        wanted_by.extend([wanted[key]] * len(jobs))
+    
+    if ENRICH_LINKEDIN:
+        with METRICS.stage('enrich'):
+            try:
+                print_enrichment(enrich_linkedin_jobs(all_jobs, all_seen))
+            except Exception as e:
+                print(f"⚠️  LinkedIn enrichment failed: {e}")
+    
+    # One term matrix for the whole batch, routed to profiles through the inverted index
+    with METRICS.stage('score'):
+        matcher = ProfileMatcher(profiles)
+        matches = matcher.match(all_jobs)
+    matcher.save_stats()
+    # Archived under the best score any profile gave the job
+    archive_jobs([
+        job.copy(match_score=max(scores.get(row, 0) for scores in matches))
+        for row, job in enumerate(all_jobs)
+    ])
+    for job in all_jobs:
+        job['description'] = job['description'][:300]
+    METRICS.count('jobs_found', len(all_jobs))
+    
+    HTTP_CACHE.save()
+    print_http_stats()
+    
+    for p, (profile, seen_store) in enumerate(zip(profiles, stores)):
+        scores = matches[p]
+        # A profile gets everything its own searches found, plus good matches from the other searches
+        profile_jobs = [
+            job.copy(match_score=scores.get(row, 0))
+            for row, job in enumerate(all_jobs)
+            if (p in wanted_by[row] or scores.get(row, 0) >= PROFILE_SHARE_MIN_SCORE)
+            and scores.get(row, 0) >= profile.min_score
+        ]
+        with METRICS.stage('dedup'):
+            new_jobs = dedup_jobs(profile_jobs, seen_store)
+        METRICS.count(f'new_jobs_{profile.slug}', len(new_jobs))
+        print(f"\n👤 {profile.name}: {len(new_jobs)} new of {len(profile_jobs)} matching jobs")
+        deliver_new_jobs(new_jobs, profile.report_file, profile.name)
+        seen_store.close()
+    NOTIFY_OUTBOX.close()
+    
+    print()
+    METRICS.print_summary()
+    METRICS.write(METRICS_DIR, HTTP_CLIENT.stats(), HTTP_CACHE.stats)
+    
+    print(f"\nMulti-profile job search completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
 # ============================================
 # RUN SCRIPT
 # ============================================
 
+def run_profiled(resume=False):
+    """Run main() under cProfile, including the search worker threads, and dump the hot functions"""
+    global _TASK_PROFILES
+    _TASK_PROFILES = []
+    PARSE_POOL.workers = 0  # Parse in the profiled threads so parsing shows up in the profile
+    profile = cProfile.Profile()
+    profile.runcall(main, resume)
+    
+    stats = pstats.Stats(profile)
+    for task_profile in _TASK_PROFILES:
+        stats.add(task_profile)
+    _TASK_PROFILES = None
+    
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+    stats.dump_stats(path)
+    print(f"🔬 Profile written to {path} (inspect with: python3 -m pstats {path})")
+    stats.sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+
+def parse_args():
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Search Indeed and LinkedIn for matching jobs")
+    parser.add_argument('--profile', action='store_true',
+                        help="run under cProfile and print the hottest functions")
+    parser.add_argument('--resume', action='store_true',
+                        help="reuse searches an interrupted run finished in the last RESUME_WINDOW_MINUTES")
+    parser.add_argument('--daemon', action='store_true',
+                        help="stay running and poll each query on its own adaptive interval")
+    parser.add_argument('--coordinator', action='store_true',
+                        help="run the search with the pages fetched by --worker processes through the work queue")
+    parser.add_argument('--worker', action='store_true',
+                        help="fetch pages from the work queue until stopped (SIGTERM)")
+    parser.add_argument('--queue', default=WORK_QUEUE_DB, metavar='PATH',
+                        help="with --coordinator/--worker: the shared work queue file (default: work_queue.db)")
+    parser.add_argument('--local-workers', type=int, default=0, metavar='N',
+                        help="with --coordinator: also start N workers on this machine")
+    parser.add_argument('--rate-share', type=int, default=1, metavar='N',
+                        help="with --worker: send 1/N of the per-host request rate (N processes share this IP)")
+    parser.add_argument('--profiles', nargs='?', const=PROFILES_DIR, metavar='PATH',
+                        help="search for every profile in PATH (a directory of JSON files or one file; "
+                             "default: profiles/), fetching shared searches once")
+    parser.add_argument('--search', nargs='?', const='', metavar='TEXT',
+                        help="search the job archive instead of the job boards, e.g. --search \"remote react director\"")
+    parser.add_argument('--days', type=float, metavar='N', help="with --search: only jobs first seen in the last N days")
+    parser.add_argument('--min-score', type=int, metavar='N', help="with --search: only jobs scoring at least N")
+    parser.add_argument('--source', metavar='SITE', help="with --search: only jobs from this site (Indeed or LinkedIn)")
+    parser.add_argument('--limit', type=int, metavar='N',
+                        help="with --search: at most N jobs, 0 for all (default: 50, or all with --report)")
+    parser.add_argument('--report', nargs='?', const=JOBS_HTML_FILE, metavar='PATH',
+                        help="with --search: write the matches to an HTML report (default: latest_jobs.html)")
+    args = parser.parse_args()
+    if args.limit is None:
+        args.limit = 0 if args.report else 50  # A rebuilt report shows every match
+    return args
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.profile:
+        run_profiled(args.resume)
+    elif args.daemon:
+        run_daemon()
+    elif args.worker:
+        run_worker(args.queue, args.rate_share)
+    elif args.coordinator:
+        run_coordinator(args.queue, args.local_workers, args.resume)
+    elif args.profiles:
+        run_profiles(load_profiles(args.profiles))
+    elif args.search is not None:
+        search_archive(args.search, args.days, args.min_score, args.source, args.limit, args.report)
+    else:
+        main(args.resume)
\ No newline at end of file
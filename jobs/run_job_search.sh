@@ -49,5 +49,10 @@ echo "========================================" >> "$LOG_FILE"
 # Keep only last 30 log files (cleanup)
 cd "$LOG_DIR" && ls -t job_search_*.log | tail -n +31 | xargs -r rm
 
+# Same for per-run metrics and profiles
+if [ -d "$SCRIPT_DIR/metrics" ]; then
+    cd "$SCRIPT_DIR/metrics" && ls -t run_*.json profile_*.prof 2>/dev/null | tail -n +31 | xargs -r rm
+fi
+
 exit $EXIT_CODE
 